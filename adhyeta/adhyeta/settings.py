@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = "dev-secret-key-change-me"
@@ -19,19 +21,78 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.staticfiles.StaticAssetMiddleware",
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.QueryTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",
+    "core.routers.ReplicaPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     # CSRF middleware stays (safe pages still protected),
     # but we will exempt specific JSON APIs in views for dev.
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "adhyeta.urls"
 
+# -----------------------------
+# Request instrumentation (core.middleware)
+# -----------------------------
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", "1.0" if DEBUG else "0.05"))
+REQUEST_QUERY_BUDGET = int(os.getenv("REQUEST_QUERY_BUDGET", "25"))
+REQUEST_LATENCY_BUDGET_MS = float(os.getenv("REQUEST_LATENCY_BUDGET_MS", "300"))
+
+# /metrics (core.metrics). Under gunicorn set METRICS_MULTIPROC_DIR to a
+# directory shared by the workers and empty it on every deploy.
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "2"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Slow-query log (core.slowqueries): JSON lines with SQL, param types, view
+# and EXPLAIN output, rotated at SLOW_QUERY_LOG_MAX_BYTES. Param values
+# (password hashes, session data, ...) are only logged with SLOW_QUERY_LOG_PARAMS=1.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+SLOW_QUERY_LOG_PARAMS = os.getenv("SLOW_QUERY_LOG_PARAMS", "0") == "1"
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", str(BASE_DIR / "var" / "log" / "slow_queries.log"))
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# JSON API responses at least this large are gzip/brotli-compressed (core.compression)
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+
+# Staff-only request profiles (core.profiling): send `X-Profile: 1` or ?_profile=1
+PROFILE_DIR = os.getenv("PROFILE_DIR", str(BASE_DIR / "var" / "profiles"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+        "json_line": {"format": '{"ts": "%(asctime)s", "query": %(message)s}'},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "plain"},
+        "slow_query_file": {
+            "class": "core.slowqueries.SlowQueryFileHandler",  # creates the directory on first write
+            "filename": SLOW_QUERY_LOG,
+            "maxBytes": SLOW_QUERY_LOG_MAX_BYTES,
+            "backupCount": 5,
+            "encoding": "utf-8",
+            "delay": True,
+            "formatter": "json_line",
+        },
+    },
+    "loggers": {
+        "core.perf": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        "core.slowquery": {"handlers": ["slow_query_file"], "level": "WARNING", "propagate": False},
+    },
+}
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -50,15 +111,151 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "adhyeta.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# -----------------------------
+# Database
+# -----------------------------
+# DB_ENGINE=sqlite (default) | postgres
+#   sqlite   — SQLITE_PATH; WAL + tuned pragmas on every connection (WAL is
+#              left off for the checked-in dev db.sqlite3, see below)
+#   postgres — DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+# DB_CONN_MAX_AGE keeps connections open across requests (seconds).
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+if DB_ENGINE not in ("sqlite", "postgres"):
+    raise ImproperlyConfigured(f"DB_ENGINE={DB_ENGINE!r}; expected one of: sqlite, postgres")
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+
+SQLITE_DEV_PATH = str(BASE_DIR / "db.sqlite3")
+SQLITE_PATH = os.getenv("SQLITE_PATH", SQLITE_DEV_PATH)
+
+SQLITE_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",     # safe with WAL, far fewer fsyncs
+    "PRAGMA busy_timeout=5000",      # wait for the write lock instead of failing
+    "PRAGMA mmap_size=134217728",    # 128 MiB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",      # ~20 MiB page cache
+]
+# journal_mode is stored in the database file, so setting it would rewrite the
+# tracked dev database on every manage.py run; real deployments set SQLITE_PATH.
+if os.path.realpath(SQLITE_PATH) != os.path.realpath(SQLITE_DEV_PATH):
+    SQLITE_PRAGMAS.insert(0, "PRAGMA journal_mode=WAL")  # readers don't block the writer
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME", "adhyeta"),
+            "USER": os.getenv("DB_USER", "adhyeta"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "127.0.0.1"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": SQLITE_PATH,
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "init_command": "; ".join(SQLITE_PRAGMAS),
+                # Take the write lock at BEGIN so busy_timeout applies, instead of
+                # failing on a read→write lock upgrade mid-transaction.
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,
+            },
+        }
+    }
+
+# Read replicas (aliases replica_1, replica_2, ...), used by core.routers:
+#   sqlite   — SQLITE_REPLICA_PATHS=/path/r1.sqlite3,/path/r2.sqlite3
+#   postgres — DB_REPLICA_HOSTS=10.0.0.2,10.0.0.3
+# Clients that wrote stay on the primary for DB_PIN_SECONDS.
+_replicas = [
+    r.strip() for r in os.getenv(
+        "DB_REPLICA_HOSTS" if DB_ENGINE == "postgres" else "SQLITE_REPLICA_PATHS", ""
+    ).split(",") if r.strip()
+]
+for _i, _target in enumerate(_replicas, start=1):
+    DATABASES[f"replica_{_i}"] = {
+        **DATABASES["default"],
+        ("HOST" if DB_ENGINE == "postgres" else "NAME"): _target,
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+DB_PIN_SECONDS = int(os.getenv("DB_PIN_SECONDS", "5"))
+
+# -----------------------------
+# Cache (per-process L1 in front of a shared L2)
+# -----------------------------
+# CACHE_L2=file (default) | db | redis | locmem
+#   db    — run `manage.py createcachetable` once
+#   redis — REDIS_URL, e.g. redis://127.0.0.1:6379/1
+CACHE_L2_BACKENDS = {
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_DIR", str(BASE_DIR / "var" / "cache")),
+    },
+    "db": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "core_cache",
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1"),
+    },
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "adhyeta-shared",
+    },
+}
+CACHE_L2 = os.getenv("CACHE_L2", "file")
+if CACHE_L2 not in CACHE_L2_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_L2={CACHE_L2!r}; expected one of: {', '.join(CACHE_L2_BACKENDS)}")
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache.TieredCache",
+        "OPTIONS": {
+            "L2": "shared",
+            "L1_MAX_ENTRIES": int(os.getenv("CACHE_L1_MAX_ENTRIES", "1000")),
+            "L1_TIMEOUT": float(os.getenv("CACHE_L1_TIMEOUT", "5")),
+        },
+    },
+    "shared": {**CACHE_L2_BACKENDS[CACHE_L2], "TIMEOUT": 300},
 }
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# -----------------------------
+# Sessions
+# -----------------------------
+# SESSION_BACKEND=db (default) | cache | cached_db | signed_cookies
+#   cache          — no DB access; sessions are lost if the cache is flushed
+#   cached_db      — reads from cache, writes through to django_session
+#   signed_cookies — stateless; session data is readable (not secret) by the client
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "db")
+if SESSION_BACKEND not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"SESSION_BACKEND={SESSION_BACKEND!r}; expected one of: {', '.join(SESSION_ENGINES)}"
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+# Bypass the per-process L1 so a logout is seen by every worker at once
+SESSION_CACHE_ALIAS = "shared"
+
+# Username or email login with a single password hash per attempt
+AUTHENTICATION_BACKENDS = ["core.backends.EmailOrUsernameBackend"]
+
+# Seconds between batched last-login flushes (core.writebehind); 0 = write immediately
+LOGIN_WRITE_BEHIND_SECONDS = float(os.getenv("LOGIN_WRITE_BEHIND_SECONDS", "5"))
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "Asia/Kolkata"
 USE_I18N = True
@@ -71,6 +268,14 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# `manage.py collectstatic` writes content-hashed names plus .gz/.br
+# variants; core.staticfiles.StaticAssetMiddleware serves them with
+# immutable caching when DEBUG is off.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Dev convenience (don’t ship like this to prod)
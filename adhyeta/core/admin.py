@@ -1,5 +1,14 @@
 # core/admin.py
-from django.contrib import admin
+import io
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import path, reverse
+from django.utils.html import format_html
+
 from .models import (
     # Accounts / profile / otp
     StudentProfile, OTPCode,
@@ -13,12 +22,27 @@ from .models import (
     StudyPlan, StudyTask,
     # Study Hub
     Exam, Subject, SubjectWeightage, Resource,
+    # Diagnostics
+    RequestProfile,
 )
+from .profiling import summarize
+from .provisioning import provision_roster
 
 # =========================
 # Accounts / Profile / OTP
 # =========================
 
+class RosterUploadForm(forms.Form):
+    roster = forms.FileField(help_text="CSV with student_name, email, phone, student_type[, password]")
+    passwords = forms.ChoiceField(
+        choices=(
+            ("unusable", "Unusable — students activate via forgot-password OTP"),
+            ("hash", "Hash the roster's password column (slow: use manage.py provision_students for large rosters)"),
+        ),
+        initial="unusable",
+    )
+
+
 @admin.register(StudentProfile)
 class StudentProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "phone", "student_type", "created_at", "last_login_at")
@@ -26,13 +50,50 @@ class StudentProfileAdmin(admin.ModelAdmin):
     list_filter = ("student_type", "created_at")
     ordering = ("-created_at",)
     readonly_fields = ("created_at", "last_login_at")
+    change_list_template = "admin/core/studentprofile/change_list.html"
+
+    def get_urls(self):
+        return [
+            path(
+                "provision/",
+                self.admin_site.admin_view(self.provision_view),
+                name="core_studentprofile_provision",
+            ),
+        ] + super().get_urls()
+
+    def provision_view(self, request):
+        """Upload a roster CSV and bulk-create students (see core.provisioning)."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = RosterUploadForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            # utf-8-sig: rosters saved from Excel start with a BOM.
+            fh = io.TextIOWrapper(form.cleaned_data["roster"].file, encoding="utf-8-sig", newline="")
+            # Hashed in this process: no process pool inside a web worker.
+            result = provision_roster(fh, password_mode=form.cleaned_data["passwords"], workers=None)
+            self.message_user(
+                request, f"Provisioned {result.created} students; skipped {len(result.skipped)}.", messages.SUCCESS
+            )
+            for lineno, email, reason in result.skipped[:20]:
+                self.message_user(request, f"Line {lineno}: {email or '<no email>'} — {reason}", messages.WARNING)
+            return redirect("admin:core_studentprofile_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Provision students from CSV",
+            "form": form,
+        }
+        return render(request, "admin/core/studentprofile/provision.html", context)
 
 
 @admin.register(OTPCode)
 class OTPCodeAdmin(admin.ModelAdmin):
-    list_display = ("user", "code", "is_used", "created_at")
-    search_fields = ("user__username", "user__email", "code")
+    list_display = ("user", "is_used", "created_at", "expires_at")
+    search_fields = ("user__username", "user__email")
     list_filter = ("is_used", "created_at")
+    readonly_fields = ("code_hash",)
     ordering = ("-created_at",)
 
 
@@ -247,8 +308,60 @@ class SubjectWeightageAdmin(admin.ModelAdmin):
 
 @admin.register(Resource)
 class ResourceAdmin(admin.ModelAdmin):
-    list_display = ("title", "kind", "subject", "year", "source")
-    list_filter = ("kind", "subject__exam", "subject", "year")
+    list_display = ("title", "kind", "subject", "year", "source", "url_status", "is_dead")
+    list_filter = ("kind", "is_dead", "subject__exam", "subject", "year")
     search_fields = ("title", "subject__name", "source")
     autocomplete_fields = ("subject",)
     ordering = ("kind", "-year", "title")
+    readonly_fields = (
+        "url_status", "url_latency_ms", "solution_status", "solution_latency_ms", "link_checked_at",
+    )
+
+
+# ===========
+# Diagnostics
+# ===========
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "view_name", "method", "status_code", "duration_ms", "query_count", "user", "download")
+    list_filter = ("view_name", "engine", "created_at")
+    search_fields = ("view_name", "path", "user__username")
+    ordering = ("-created_at",)
+    readonly_fields = (
+        "created_at", "user", "view_name", "method", "path", "status_code",
+        "duration_ms", "query_count", "engine", "file_path", "download", "top_functions",
+    )
+
+    def has_add_permission(self, request):
+        return False  # created by core.profiling.ProfilingMiddleware
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="core_requestprofile_download",
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        try:
+            fh = open(profile.file_path, "rb")
+        except OSError:
+            raise Http404("Profile file is gone")
+        return FileResponse(fh, as_attachment=True, filename=profile.file_path.rsplit("/", 1)[-1])
+
+    @admin.display(description="File")
+    def download(self, obj):
+        return format_html('<a href="{}">download</a>', reverse("admin:core_requestprofile_download", args=[obj.pk]))
+
+    @admin.display(description="Top functions (cumulative)")
+    def top_functions(self, obj):
+        return format_html("<pre>{}</pre>", summarize(obj))
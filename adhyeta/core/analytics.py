@@ -0,0 +1,152 @@
+# core/analytics.py
+import math
+
+from django.core.cache import cache
+
+from .models import SubjectWeightage
+
+
+# ======================
+# Weightage trends
+# ======================
+
+TRENDS_CACHE_TIMEOUT = 60 * 60 * 6
+DEFAULT_WINDOW = 3
+
+
+def _cache_key(exam_id):
+    # One entry per exam holding {window: report}, so invalidation is a single delete.
+    return f"weightage-trends:{exam_id}"
+
+
+def load_weightage_matrix(exam_id):
+    """
+    Load every yearly SubjectWeightage row for an exam in one query.
+
+    Returns (subjects, years, matrix) where matrix[i, j] is the weight of
+    subjects[i] in years[j], NaN where that year has no data.
+    """
+    import numpy as np  # only the trends endpoint/command need it, not every request
+
+    rows = list(
+        SubjectWeightage.objects.filter(subject__exam_id=exam_id, year__isnull=False)
+        .order_by()
+        .values_list("subject_id", "subject__name", "year", "weight_percent")
+    )
+    if not rows:
+        return [], np.empty(0, dtype=np.int64), np.empty((0, 0))
+
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    yrs = np.fromiter((r[2] for r in rows), dtype=np.int64, count=len(rows))
+    vals = np.fromiter((r[3] for r in rows), dtype=np.float64, count=len(rows))
+
+    subject_ids, row_idx = np.unique(ids, return_inverse=True)
+    years, col_idx = np.unique(yrs, return_inverse=True)
+    names = {r[0]: r[1] for r in rows}
+
+    matrix = np.full((len(subject_ids), len(years)), np.nan)
+    matrix[row_idx, col_idx] = vals  # duplicate (subject, year) rows: last one wins
+
+    subjects = [{"id": int(sid), "name": names[sid]} for sid in subject_ids]
+    return subjects, years, matrix
+
+
+def compute_trends(years, matrix, window=DEFAULT_WINDOW):
+    """
+    Vectorized per-subject statistics over a (subjects x years) matrix:
+    least-squares slope (pp/year), moving average of the last `window`
+    years, latest observed weight and the predicted next-year weight.
+    """
+    import numpy as np
+
+    mask = ~np.isnan(matrix)
+    n = mask.sum(axis=1)
+    x = np.broadcast_to(years.astype(np.float64), matrix.shape)
+    y = np.where(mask, matrix, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(mask, x, 0.0).sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0.0)
+        dy = np.where(mask, y - y_mean[:, None], 0.0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    slope = np.where(n >= 2, slope, 0.0)
+
+    recent = matrix[:, -window:] if window > 0 else matrix
+    recent_n = (~np.isnan(recent)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        moving_avg = np.nansum(recent, axis=1) / recent_n
+    moving_avg = np.where(recent_n > 0, moving_avg, np.nan)
+
+    # Latest observed value per subject (rightmost non-NaN column)
+    last_col = matrix.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    latest = matrix[np.arange(matrix.shape[0]), last_col]
+
+    next_year = years[-1] + 1
+    predicted = y_mean + slope * (next_year - x_mean)
+    predicted = np.clip(np.where(np.isnan(predicted), latest, predicted), 0, 100)
+
+    return {
+        "slope": slope,
+        "moving_avg": moving_avg,
+        "latest": latest,
+        "predicted": predicted,
+        "next_year": next_year,
+    }
+
+
+def weightage_trends(exam_id, window=DEFAULT_WINDOW, refresh=False):
+    """Cached trend report for one exam (JSON-ready)."""
+    key = _cache_key(exam_id)
+    entry = {} if refresh else (cache.get(key) or {})
+    if window in entry:
+        return entry[window]
+
+    subjects, years, matrix = load_weightage_matrix(exam_id)
+    report = {"years": [int(y) for y in years], "next_year": None, "subjects": []}
+    if subjects:
+        t = compute_trends(years, matrix, window=window)
+        report["next_year"] = int(t["next_year"])
+        for i, s in enumerate(subjects):
+            report["subjects"].append(
+                {
+                    **s,
+                    "latest": _num(t["latest"][i]),
+                    "slope": _num(t["slope"][i], 2),
+                    "moving_avg": _num(t["moving_avg"][i]),
+                    "predicted": _num(t["predicted"][i]),
+                }
+            )
+        report["subjects"].sort(key=lambda s: -(s["predicted"] or 0))
+
+    entry[window] = report
+    cache.set(key, entry, TRENDS_CACHE_TIMEOUT)
+    return report
+
+
+def planner_allocation(exam_id, total_minutes):
+    """
+    Split a study budget across subjects in proportion to their predicted
+    next-year weight. Returns [{subject, minutes}] highest priority first.
+    """
+    import numpy as np
+
+    subjects = weightage_trends(exam_id)["subjects"]
+    weights = np.array([s["predicted"] or 0 for s in subjects], dtype=np.float64)
+    if not len(weights) or weights.sum() <= 0:
+        return []
+    minutes = np.floor(weights / weights.sum() * total_minutes).astype(int)
+    return [
+        {"subject_id": s["id"], "subject": s["name"], "minutes": int(m)}
+        for s, m in zip(subjects, minutes)
+        if m > 0
+    ]
+
+
+def invalidate_weightage_trends(sender, instance, **kwargs):
+    """post_save/post_delete hook for SubjectWeightage."""
+    cache.delete(_cache_key(instance.subject.exam_id))
+
+
+def _num(v, digits=1):
+    return None if math.isnan(v) else round(float(v), digits)
@@ -1,5 +1,28 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+
+        from .analytics import invalidate_weightage_trends
+        from .cache import invalidate_catalog
+        from .models import Course, Lesson, RequestProfile, SubjectWeightage, Topic
+        from .profiling import delete_profile_file
+        from .search import ensure_search_triggers
+        from .utils import update_last_login
+        post_migrate.connect(ensure_search_triggers, sender=self)
+        post_save.connect(invalidate_weightage_trends, sender=SubjectWeightage)
+        post_delete.connect(invalidate_weightage_trends, sender=SubjectWeightage)
+        for model in (Course, Topic, Lesson):
+            post_save.connect(invalidate_catalog, sender=model)
+            post_delete.connect(invalidate_catalog, sender=model)
+        post_delete.connect(delete_profile_file, sender=RequestProfile)
+
+        # Swap Django's per-login UPDATE for the write-behind buffer
+        user_logged_in.disconnect(dispatch_uid="update_last_login")
+        user_logged_in.connect(update_last_login, dispatch_uid="core_update_last_login")
@@ -0,0 +1,47 @@
+# core/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+
+UserModel = get_user_model()
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """
+    Authenticate with either the username or a case-insensitive email in
+    one lookup, running the password hasher exactly once per attempt.
+
+    The email match goes through LOWER(email) so it can use the
+    core_auth_user_email_lower expression index (migration 0010).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if not username or password is None:
+            return None
+
+        candidates = list(self.candidates(username))
+        # An exact username match wins over an email match on another account.
+        user = next((u for u in candidates if u.get_username() == username), None)
+        if user is None and candidates:
+            user = candidates[0]
+
+        if user is None:
+            # Run the hasher anyway so unknown users take as long as wrong passwords.
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    @staticmethod
+    def candidates(username):
+        """Users whose username or (case-insensitive) email is `username`."""
+        return (
+            UserModel._default_manager.annotate(email_lower=Lower("email"))
+            .filter(Q(**{UserModel.USERNAME_FIELD: username}) | Q(email_lower=username.lower()))
+            .order_by("id")[:5]
+        )
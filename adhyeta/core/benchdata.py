@@ -0,0 +1,188 @@
+# core/benchdata.py
+import math
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import invalidate_catalog
+from .models import (
+    StudentProfile,
+    Course, Topic, Lesson, Enrollment, LessonProgress,
+    QuizQuestion, QuizChoice,
+    Exam, Subject, SubjectWeightage, Resource,
+)
+
+
+# ======================
+# Deterministic benchmark dataset
+# ======================
+
+BENCH_PASSWORD = "bench-pass-123"
+BENCH_PREFIX = "bench-"
+BENCH_SALT = "adhyetaBenchDatasetSalt2024"
+CHUNK = 5000
+
+SCALES = {
+    #          users  courses lessons  questions progress
+    "tiny":   (50,    5,      100,     400,      2_000),
+    "small":  (1_000, 50,     5_000,   20_000,   100_000),
+    "medium": (5_000, 200,    20_000,  100_000,  1_000_000),
+    "large":  (10_000, 500,   50_000,  200_000,  5_000_000),
+}
+TOPICS_PER_COURSE = 10
+
+
+def bench_username(i):
+    return f"{BENCH_PREFIX}{i:06d}@example.com"
+
+
+def _chunks(rows, size=CHUNK):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _bulk(model, rows):
+    for chunk in _chunks(rows):
+        model.objects.bulk_create(chunk)
+
+
+def dataset_present(scale):
+    users = SCALES[scale][0]
+    return (
+        User.objects.filter(username=bench_username(users - 1)).exists()
+        and not User.objects.filter(username=bench_username(users)).exists()
+    )
+
+
+def generate_dataset(scale="small", seed=68, log=None):
+    """
+    Bulk-insert a synthetic dataset of the given scale. The same scale and
+    seed always produce the same rows (and, on a fresh database, the same
+    ids), so benchmark runs are comparable across commits. Every user's
+    password is BENCH_PASSWORD. Returns the counts created.
+    """
+    n_users, n_courses, n_lessons, n_questions, n_progress = SCALES[scale]
+    rng = random.Random(seed)
+    log = log or (lambda msg: None)
+    now = timezone.now().replace(microsecond=0)
+
+    with transaction.atomic():
+        # One hash for everyone: hashing 10k passwords would dominate the run. The
+        # salt is fixed for reproducible rows but long enough (>= 128 bits) that
+        # must_update() is False; a short one rehashes and saves on every login.
+        pw = make_password(BENCH_PASSWORD, salt=BENCH_SALT)
+        _bulk(User, [
+            User(username=bench_username(i), email=bench_username(i), password=pw,
+                 first_name=f"Student{i}", last_name="Bench")
+            for i in range(n_users)
+        ])
+        user_ids = list(
+            User.objects.filter(username__startswith=BENCH_PREFIX).order_by("username").values_list("id", flat=True)
+        )
+        _bulk(StudentProfile, [
+            StudentProfile(user_id=uid, phone=f"98{i:08d}", student_type=rng.choice(["school", "college", "jee", "neet"]))
+            for i, uid in enumerate(user_ids)
+        ])
+        log(f"users: {n_users}")
+
+        _bulk(Course, [
+            Course(title=f"{BENCH_PREFIX}course {c:04d}", description=f"Synthetic course {c}")
+            for c in range(n_courses)
+        ])
+        course_ids = list(
+            Course.objects.filter(title__startswith=BENCH_PREFIX).order_by("title").values_list("id", flat=True)
+        )
+        _bulk(Topic, [
+            Topic(course_id=cid, title=f"Topic {t:02d}", summary=f"Topic {t} of course {c}")
+            for c, cid in enumerate(course_ids) for t in range(TOPICS_PER_COURSE)
+        ])
+        topic_ids = list(
+            Topic.objects.filter(course_id__in=course_ids).order_by("course_id", "title").values_list("id", flat=True)
+        )
+        per_topic = max(1, n_lessons // len(topic_ids))
+        words = ["array", "stack", "queue", "graph", "tree", "heap", "hash", "sort", "search", "dynamic"]
+        _bulk(Lesson, [
+            Lesson(topic_id=tid, order=o, title=f"Lesson {o}",
+                   content=" ".join(rng.choice(words) for _ in range(60)))
+            for tid in topic_ids for o in range(per_topic)
+        ])
+        lesson_ids = list(
+            Lesson.objects.filter(topic_id__in=topic_ids).order_by("topic_id", "order").values_list("id", flat=True)
+        )
+        log(f"courses: {n_courses}, topics: {len(topic_ids)}, lessons: {len(lesson_ids)}")
+
+        _bulk(QuizQuestion, [
+            QuizQuestion(topic_id=topic_ids[q % len(topic_ids)], text=f"Bench question {q}",
+                         difficulty=("easy", "med", "hard")[q % 3], explanation="Synthetic.")
+            for q in range(n_questions)
+        ])
+        question_ids = QuizQuestion.objects.filter(
+            topic_id__in=topic_ids, text__startswith="Bench question "
+        ).values_list("id", flat=True).iterator(chunk_size=CHUNK)
+        choices = []
+        for qid in question_ids:
+            correct = rng.randrange(4)
+            choices.extend(QuizChoice(question_id=qid, text=f"Option {k}", is_correct=k == correct) for k in range(4))
+            if len(choices) >= CHUNK:
+                QuizChoice.objects.bulk_create(choices)
+                choices = []
+        QuizChoice.objects.bulk_create(choices)
+        log(f"questions: {n_questions}")
+
+        # Each user completes a random slice of lessons in a few enrolled
+        # courses: at least 3, and enough to hold per_user lessons.
+        per_user = max(1, n_progress // n_users)
+        lessons_by_course = {}
+        for lid, cid in Lesson.objects.filter(id__in=lesson_ids).values_list("id", "topic__course_id").iterator(chunk_size=CHUNK):
+            lessons_by_course.setdefault(cid, []).append(lid)
+        per_course = min(len(v) for v in lessons_by_course.values())
+        n_enrolled = min(len(course_ids), max(3, math.ceil(per_user / per_course)))
+        progress, enrollments, written = [], [], 0
+        for uid in user_ids:
+            courses = rng.sample(course_ids, n_enrolled)
+            enrollments.extend(Enrollment(user_id=uid, course_id=cid) for cid in courses)
+            pool = [lid for cid in courses for lid in lessons_by_course.get(cid, ())]
+            for lid in rng.sample(pool, min(per_user, len(pool))):
+                progress.append(LessonProgress(
+                    user_id=uid, lesson_id=lid, completed=rng.random() < 0.8,
+                    completed_at=now - timedelta(minutes=rng.randrange(60 * 24 * 30)),
+                ))
+            if len(progress) >= CHUNK:
+                LessonProgress.objects.bulk_create(progress)
+                written += len(progress)
+                progress = []
+        LessonProgress.objects.bulk_create(progress)
+        written += len(progress)
+        _bulk(Enrollment, enrollments)
+        stored = LessonProgress.objects.filter(user__username__startswith=BENCH_PREFIX).count()
+        if stored != n_progress:
+            # Raising rolls the whole dataset back, so it cannot drift from SCALES unnoticed.
+            raise RuntimeError(f"{scale} dataset wrote {stored} progress rows; SCALES promises {n_progress}")
+        log(f"progress rows: {written}")
+
+        exam = Exam.objects.create(name=f"{BENCH_PREFIX}exam", slug=f"{BENCH_PREFIX}exam")
+        _bulk(Subject, [Subject(exam=exam, name=f"Subject {s}") for s in range(8)])
+        subject_ids = list(Subject.objects.filter(exam=exam).order_by("name").values_list("id", flat=True))
+        _bulk(SubjectWeightage, [
+            SubjectWeightage(subject_id=sid, year=y, weight_percent=rng.randrange(5, 25))
+            for sid in subject_ids for y in range(2015, 2025)
+        ])
+        _bulk(Resource, [
+            Resource(subject_id=subject_ids[r % len(subject_ids)], kind=("youtube", "notes", "paper")[r % 3],
+                     title=f"{rng.choice(words).title()} resource {r}", url=f"https://example.com/r/{r}",
+                     source="bench", year=2015 + r % 10)
+            for r in range(max(100, n_lessons // 10))
+        ])
+
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    invalidate_catalog()  # bulk_create skips the catalog signals
+    return {
+        "users": n_users, "courses": n_courses, "lessons": len(lesson_ids),
+        "questions": n_questions, "progress": written,
+    }
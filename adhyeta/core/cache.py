@@ -0,0 +1,233 @@
+# core/cache.py
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .compression import precompress
+from .jsonrender import raw_response
+
+
+# ======================
+# Tiered cache backend
+# ======================
+
+# L1 stores shared by every instance (one per thread) of the same
+# LOCATION and L2, as LocMemCache does.
+_l1_stores = {}
+_l1_locks = {}
+
+
+class TieredCache(BaseCache):
+    """
+    Per-process LRU (L1) in front of a shared cache alias (L2).
+
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache.TieredCache",
+            "OPTIONS": {"L2": "shared", "L1_MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+        },
+        "shared": {...},  # file / db / redis
+    }
+
+    Reads hit L1 first. L1 entries live at most L1_TIMEOUT seconds, which
+    bounds how stale one worker can be after another worker writes. Atomic
+    operations (add, incr) go straight to L2.
+    """
+
+    def __init__(self, location, params):
+        options = params.get("OPTIONS", {})
+        super().__init__(params)
+        self._l2_alias = options.get("L2", "shared")
+        self._l1_max = int(options.get("L1_MAX_ENTRIES", 1000))
+        self._l1_timeout = float(options.get("L1_TIMEOUT", 5))
+        name = (location, self._l2_alias)
+        self._l1 = _l1_stores.setdefault(name, OrderedDict())
+        self._lock = _l1_locks.setdefault(name, threading.Lock())
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    # ---- L1 plumbing ----
+    def _l1_get(self, key):
+        with self._lock:
+            hit = self._l1.get(key)
+            if hit is None:
+                return False, None
+            expires, value = hit
+            if expires <= time.monotonic():
+                del self._l1[key]
+                return False, None
+            self._l1.move_to_end(key)
+            return True, value
+
+    def _l1_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        ttl = self._l1_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            ttl = min(timeout, ttl)
+        if ttl <= 0:
+            return self._l1_delete(key)
+        with self._lock:
+            self._l1[key] = (time.monotonic() + ttl, value)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self._l1_max:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, key):
+        with self._lock:
+            self._l1.pop(key, None)
+
+    # ---- cache API ----
+    # L1 is keyed by this backend's full key; L2 gets the raw key and
+    # version and applies its own KEY_PREFIX / versioning.
+    def get(self, key, default=None, version=None):
+        full = self.make_and_validate_key(key, version=version)
+        found, value = self._l1_get(full)
+        if found:
+            return value
+        sentinel = object()
+        value = self.l2.get(key, sentinel, version=version)
+        if value is sentinel:
+            return default
+        self._l1_set(full, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full = self.make_and_validate_key(key, version=version)
+        self.l2.set(key, value, timeout, version=version)
+        self._l1_set(full, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full = self.make_and_validate_key(key, version=version)
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._l1_set(full, value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._l1_delete(self.make_and_validate_key(key, version=version))
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        full = self.make_and_validate_key(key, version=version)
+        return self._l1_get(full)[0] or self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._l1_delete(self.make_and_validate_key(key, version=version))
+        return self.l2.incr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        self.l2.clear()
+
+
+# ======================
+# Cached JSON views
+# ======================
+
+def _version_key(namespace):
+    return f"cache-version:{namespace}"
+
+
+def cache_version(namespace, cache=None):
+    cache = cache or caches["default"]
+    v = cache.get(_version_key(namespace))
+    if v is None:
+        cache.add(_version_key(namespace), 1, None)
+        v = cache.get(_version_key(namespace)) or 1
+    return v
+
+
+def bump_cache_version(namespace, cache=None):
+    """Invalidate every cached_json entry in `namespace`."""
+    cache = cache or caches["default"]
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), 2, None)
+
+
+def invalidate_catalog(sender=None, **kwargs):
+    """post_save/post_delete hook for Course, Topic and Lesson."""
+    bump_cache_version("catalog")
+
+
+def cached_json(namespace, timeout=300, soft_timeout=60, vary_on_user=False, lock_timeout=10, wait=2.0):
+    """
+    Cache successful JSON responses of a GET view.
+
+    - Keys include `namespace`'s version (bump_cache_version invalidates),
+      the query string and, with vary_on_user, the user id.
+    - After `soft_timeout` seconds an entry is stale: the first request to
+      see it recomputes while everyone else keeps getting the stale copy.
+    - On a miss only one request (across workers, via cache.add) computes;
+      the others wait up to `wait` seconds for its result.
+    - Entries carry precompressed gzip/brotli variants of the body.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            cache = caches["default"]
+            who = request.user.pk if vary_on_user and request.user.is_authenticated else "anon"
+            qs = hashlib.sha1(request.META.get("QUERY_STRING", "").encode()).hexdigest()[:16]
+            key = f"view:{view.__name__}:v{cache_version(namespace, cache)}:{who}:{qs}"
+            lock_key = f"{key}:lock"
+
+            entry = cache.get(key)
+            now = time.time()
+            if entry is not None:
+                if entry["fresh_until"] > now or not cache.add(lock_key, 1, lock_timeout):
+                    return _from_entry(entry)
+                return _compute(request, view, args, kwargs, cache, key, lock_key, timeout, soft_timeout)
+
+            if cache.add(lock_key, 1, lock_timeout):
+                return _compute(request, view, args, kwargs, cache, key, lock_key, timeout, soft_timeout)
+
+            # Someone else is computing: wait briefly for their result.
+            deadline = now + wait
+            while time.time() < deadline:
+                time.sleep(0.05)
+                entry = cache.get(key)
+                if entry is not None:
+                    return _from_entry(entry)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def _compute(request, view, args, kwargs, cache, key, lock_key, timeout, soft_timeout):
+    try:
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            # Compressed variants are built here, once per entry, and
+            # picked up by core.compression.CompressionMiddleware.
+            response.precompressed = precompress(response.content)
+            cache.set(key, {
+                "content": response.content,
+                "content_type": response["Content-Type"],
+                "encoded": response.precompressed,
+                "fresh_until": time.time() + soft_timeout,
+            }, timeout)
+        return response
+    finally:
+        cache.delete(lock_key)
+
+
+def _from_entry(entry):
+    # The stored bytes go out as-is: no dict -> str -> bytes on a hit.
+    response = raw_response(entry["content"], content_type=entry["content_type"])
+    response.precompressed = entry.get("encoded") or {}
+    return response
@@ -0,0 +1,115 @@
+# core/compression.py
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:  # optional: ~15-25% smaller than gzip on lesson/catalog JSON
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+# ======================
+# Encodings
+# ======================
+
+# API payloads only. HTML is left alone: the SPA page embeds the CSRF token,
+# and compressing secrets next to reflected input invites BREACH.
+COMPRESSIBLE_TYPES = ("application/json", "text/plain")
+
+_accept_re = re.compile(r"\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?", re.IGNORECASE)
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data, encoding, fast=True):
+    """
+    Compress `data` with `encoding`. `fast` (per request) trades ratio
+    for CPU; precompressed cache entries are built once and use the
+    slowest, smallest settings.
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=5 if fast else 11)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6 if fast else 9, mtime=0)
+    raise ValueError(f"unsupported encoding {encoding!r}")
+
+
+def precompress(data):
+    """{encoding: bytes} for every available encoding, or {} below the size threshold."""
+    if len(data) < settings.COMPRESS_MIN_BYTES:
+        return {}
+    return {enc: compress(data, enc, fast=False) for enc in available_encodings()}
+
+
+def negotiate(accept_encoding, offered=None):
+    """
+    The first of `offered` (default: the encodings we can produce, brotli
+    first) that the client accepts with q > 0, or None.
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        m = _accept_re.match(part)
+        if m:
+            q = m.group(2)
+            try:
+                accepted[m.group(1).lower()] = float(q) if q is not None else 1.0
+            except ValueError:
+                continue
+    for enc in available_encodings() if offered is None else offered:
+        q = accepted.get(enc, accepted.get("*", 0.0))
+        if q > 0:
+            return enc
+    return None
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";", 1)[0].strip().lower()
+    return content_type in COMPRESSIBLE_TYPES
+
+
+# ======================
+# Middleware
+# ======================
+
+class CompressionMiddleware:
+    """
+    brotli/gzip for JSON API responses of at least COMPRESS_MIN_BYTES.
+
+    A view (or cached_json) can attach ready-made variants as
+    `response.precompressed = {"br": ..., "gzip": ...}`; those are sent as-is
+    so cached payloads are compressed once per cache entry, not per request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or not is_compressible(response) or response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if len(response.content) < settings.COMPRESS_MIN_BYTES:
+            return response
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if encoding is None:
+            return response
+
+        body = (getattr(response, "precompressed", None) or {}).get(encoding)
+        if body is None:
+            body = compress(response.content, encoding)
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag  # the representation changed
+        return response
@@ -0,0 +1,167 @@
+# core/dedupe.py
+import functools
+import hashlib
+import re
+from collections import defaultdict
+
+from django.utils.html import strip_tags
+
+from .models import QuizQuestion
+
+
+# ======================
+# Near-duplicate questions (MinHash + LSH)
+# ======================
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidate pairs from roughly Jaccard >= 0.7
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize(text):
+    return _NON_WORD.sub(" ", strip_tags(text or "").lower()).strip()
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Character k-shingles of the normalized text (short questions need chars, not words)."""
+    t = normalize(text)
+    if len(t) <= k:
+        return {t} if t else set()
+    return {t[i:i + k] for i in range(len(t) - k + 1)}
+
+
+@functools.lru_cache(maxsize=None)
+def _permutations():
+    """
+    (a, b) coefficients of the NUM_PERM hash permutations. numpy is imported
+    here rather than at module level so importing core.importers (and the
+    URLconf through it) does not require it.
+    """
+    import numpy as np
+
+    rng = np.random.RandomState(68)  # fixed seed: signatures must be stable across runs
+    a = rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)  # a*h stays below 2**63
+    b = rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+    return a, b
+
+
+def minhash(text):
+    """128-value MinHash signature of `text` as a uint64 array."""
+    import numpy as np
+
+    sh = shingles(text)
+    if not sh:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    a, b = _permutations()
+    h = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in sh),
+        dtype=np.uint64, count=len(sh),
+    )
+    # (a*h + b) mod p for every permutation x shingle, then min per permutation
+    perms = (np.outer(a, h) + b[:, None]) % np.uint64(_MERSENNE) & np.uint64(_MAX_HASH)
+    return perms.min(axis=1)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float((sig_a == sig_b).mean())
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures. `query` only compares against items
+    sharing at least one band bucket, so lookups stay sub-linear in the
+    index size.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.buckets = defaultdict(list)
+        self.signatures = {}
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [(b, sig[b * r:(b + 1) * r].tobytes()) for b in range(self.bands)]
+
+    def add(self, key, sig):
+        self.signatures[key] = sig
+        for bk in self._band_keys(sig):
+            self.buckets[bk].append(key)
+
+    def query(self, sig):
+        """[(key, similarity)] of indexed items at or above the threshold, best first."""
+        seen = set()
+        hits = []
+        for bk in self._band_keys(sig):
+            for key in self.buckets.get(bk, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                s = similarity(sig, self.signatures[key])
+                if s >= self.threshold:
+                    hits.append((key, s))
+        hits.sort(key=lambda x: -x[1])
+        return hits
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+class QuestionDeduper:
+    """
+    Per-topic LSH indexes over the existing quiz bank, built lazily the
+    first time a topic is seen. Used by the importer to flag new questions
+    that nearly duplicate one already stored (or earlier in the same import).
+
+    Questions accepted by `check` are staged until `commit()`, so a batch
+    that is rolled back leaves nothing behind in the indexes.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._indexes = {}
+        self._pending = {}  # topic_id -> LSHIndex of questions in the open batch
+
+    def _index(self, topic_id):
+        idx = self._indexes.get(topic_id)
+        if idx is None:
+            idx = self._indexes[topic_id] = LSHIndex(self.threshold)
+            for qid, text in QuizQuestion.objects.filter(topic_id=topic_id).values_list("id", "text").iterator():
+                idx.add(qid, minhash(text))
+        return idx
+
+    def check(self, topic_id, text, key):
+        """
+        Return the best near-duplicate (key, similarity) or None. When the
+        text is not a duplicate it is staged under `key`.
+        """
+        sig = minhash(text)
+        hits = self._index(topic_id).query(sig)
+        pending = self._pending.get(topic_id)
+        if pending is not None:
+            hits += pending.query(sig)
+        if hits:
+            return max(hits, key=lambda x: x[1])
+        if pending is None:
+            pending = self._pending[topic_id] = LSHIndex(self.threshold)
+        pending.add(key, sig)
+        return None
+
+    def commit(self):
+        """Move staged questions into the indexes once their batch is committed."""
+        for topic_id, staged in self._pending.items():
+            idx = self._index(topic_id)
+            for key, sig in staged.signatures.items():
+                idx.add(key, sig)
+        self._pending = {}
+
+    def rollback(self):
+        self._pending = {}
@@ -0,0 +1,88 @@
+# core/idempotency.py
+import functools
+import hashlib
+import zlib
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .jsonrender import JSONResponse
+
+
+# ======================
+# Idempotency-Key support
+# ======================
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_TTL = 60 * 60 * 24
+IN_FLIGHT_TTL = 60
+
+_PENDING = "pending"
+_DONE = "done"
+
+
+def _store():
+    # The shared alias, not the tiered default: a worker must never see a
+    # stale per-process "pending" entry after another worker finished.
+    return caches["shared"]
+
+
+def idempotent(view):
+    """
+    Honour an `Idempotency-Key` header on a non-idempotent POST view.
+
+    The first request with a key runs the view and stores its response
+    (zlib-compressed) for IDEMPOTENCY_TTL. Retries with the same key and
+    body get that response replayed with one cache lookup. A retry while
+    the first is still running gets 409, and reusing a key with a
+    different body gets 422. Keys are scoped per view and per user.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        raw_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not raw_key:
+            return view(request, *args, **kwargs)
+
+        store = _store()
+        who = request.user.pk if request.user.is_authenticated else "anon"
+        digest = hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+        key = f"idem:{view.__name__}:{who}:{digest}"
+        fingerprint = hashlib.sha256(request.body).hexdigest()[:32]
+
+        entry = store.get(key)
+        if entry is None and store.add(key, {"state": _PENDING, "fp": fingerprint}, IN_FLIGHT_TTL):
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                store.delete(key)
+                raise
+            if response.status_code >= 500 or response.streaming:
+                store.delete(key)
+            else:
+                store.set(key, {
+                    "state": _DONE,
+                    "fp": fingerprint,
+                    "status": response.status_code,
+                    "content_type": response["Content-Type"],
+                    "body": zlib.compress(response.content),
+                }, IDEMPOTENCY_TTL)
+            return response
+
+        entry = entry or store.get(key) or {"state": _PENDING, "fp": fingerprint}
+        if entry["fp"] != fingerprint:
+            return JSONResponse(
+                {"ok": False, "error": f"{IDEMPOTENCY_HEADER} was already used with a different request."},
+                status=422,
+            )
+        if entry["state"] != _DONE:
+            return JSONResponse(
+                {"ok": False, "error": "A request with this Idempotency-Key is still in progress."}, status=409
+            )
+
+        response = HttpResponse(
+            zlib.decompress(entry["body"]), status=entry["status"], content_type=entry["content_type"]
+        )
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    return wrapper
@@ -0,0 +1,346 @@
+# core/importers.py
+import csv
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.db import transaction
+
+from .cache import invalidate_catalog
+from .dedupe import QuestionDeduper
+from .models import Course, Topic, Lesson, QuizQuestion, QuizChoice
+
+
+# ======================
+# Streaming content import
+# ======================
+
+RECORD_TYPES = ("course", "topic", "lesson", "question")
+DIFFICULTIES = {value for value, _ in QuizQuestion.DIFFICULTY}
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ContentImportError(ValueError):
+    """Raised for malformed records; the message carries the source location."""
+
+
+def read_records(path, record_type=None):
+    """
+    Stream records from a .jsonl or .csv file one at a time.
+
+    JSONL lines carry their own "type". CSV files either have a `type`
+    column or are all of `record_type`. Question choices in CSV are given as
+    `choices` ("A|B|C") plus `answer` (the correct choice text).
+    """
+    path = Path(path)
+    # utf-8-sig: CSVs saved from Excel start with a BOM.
+    with path.open(newline="", encoding="utf-8-sig") as fh:
+        if path.suffix.lower() == ".csv":
+            for lineno, row in enumerate(csv.DictReader(fh), start=2):
+                row = {k: v for k, v in row.items() if k}
+                row.setdefault("type", record_type)
+                if row.get("type") == "question" and "choices" in row:
+                    answer = (row.pop("answer", "") or "").strip()
+                    row["choices"] = [
+                        {"text": c.strip(), "correct": c.strip() == answer}
+                        for c in (row["choices"] or "").split("|") if c.strip()
+                    ]
+                yield f"{path.name}:{lineno}", row
+        else:
+            for lineno, line in enumerate(fh, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ContentImportError(f"{path.name}:{lineno}: {e}") from e
+                if not isinstance(row, dict):
+                    raise ContentImportError(f"{path.name}:{lineno}: expected a JSON object, got {type(row).__name__}")
+                row.setdefault("type", record_type)
+                yield f"{path.name}:{lineno}", row
+
+
+class ContentImporter:
+    """
+    Buffers records per type and writes them in chunked transactions.
+
+    Natural keys:
+      course   → title
+      topic    → (course title, topic title)          upsert on unique_topic_per_course
+      lesson   → (course, topic, order)                upsert on unique_lesson_order_per_topic
+      question → (course, topic, question text)
+
+    Re-running the same input updates rows in place instead of duplicating
+    them; questions that carry `choices` get their stored choices synced
+    (matched by text). Memory is bounded by `batch_size` records per type.
+
+    New questions that nearly duplicate one already in the same topic are
+    recorded in `duplicates` and still imported, unless `skip_duplicates`.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, dedupe=True, skip_duplicates=False):
+        self.batch_size = batch_size
+        self.buffers = {t: [] for t in RECORD_TYPES}
+        self.stats = {t: 0 for t in RECORD_TYPES}
+        self.deduper = QuestionDeduper() if dedupe else None
+        self.skip_duplicates = skip_duplicates
+        self.duplicates = []  # (topic_id, text, matched id or text, similarity)
+
+    # ---- public API ----
+    def feed(self, records):
+        """Consume an iterable of (location, record) pairs or plain dicts."""
+        for item in records:
+            loc, rec = item if isinstance(item, tuple) else ("<record>", item)
+            self.add(rec, loc)
+        self.flush()
+        return self.stats
+
+    def add(self, rec, loc="<record>"):
+        if not isinstance(rec, dict):
+            raise ContentImportError(f"{loc}: expected an object, got {type(rec).__name__}")
+        rtype = self._s(rec.get("type")).lower()
+        if rtype not in self.buffers:
+            raise ContentImportError(f"{loc}: unknown record type {rtype!r}")
+        missing = [k for k in self._required(rtype) if not str(rec.get(k) or "").strip()]
+        if missing:
+            raise ContentImportError(f"{loc}: {rtype} is missing {', '.join(missing)}")
+        self.buffers[rtype].append((loc, self._validate(rtype, rec, loc)))
+        if len(self.buffers[rtype]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every buffered record, parents before children."""
+        if not any(self.buffers.values()):
+            return
+        try:
+            with transaction.atomic():
+                for rtype in RECORD_TYPES:
+                    rows, self.buffers[rtype] = self.buffers[rtype], []
+                    if rows:
+                        getattr(self, f"_write_{rtype}s")(rows)
+                        self.stats[rtype] += len(rows)
+                if self.deduper:
+                    # Index the batch's questions only once it is really committed.
+                    transaction.on_commit(self.deduper.commit)
+        except Exception:
+            if self.deduper:
+                self.deduper.rollback()
+            raise
+        # bulk_create/bulk_update skip model signals
+        invalidate_catalog()
+
+    # ---- helpers ----
+    @staticmethod
+    def _required(rtype):
+        return {
+            "course": ("title",),
+            "topic": ("course", "title"),
+            "lesson": ("course", "topic", "order", "title"),
+            "question": ("course", "topic", "text"),
+        }[rtype]
+
+    def _validate(self, rtype, rec, loc):
+        """Type-check the fields the writers convert, so bad rows fail with their location."""
+        if rtype == "lesson":
+            order = rec["order"]
+            try:
+                if isinstance(order, (bool, float)):
+                    raise ValueError
+                order = int(self._s(order))
+            except ValueError:
+                raise ContentImportError(f"{loc}: lesson order must be an integer, got {rec['order']!r}") from None
+            return {**rec, "order": order}
+        if rtype == "question":
+            difficulty = self._s(rec.get("difficulty")) or "easy"
+            if difficulty not in DIFFICULTIES:
+                raise ContentImportError(
+                    f"{loc}: question difficulty must be one of {sorted(DIFFICULTIES)}, got {difficulty!r}"
+                )
+            choices = rec.get("choices")
+            if choices is not None and not (
+                isinstance(choices, list)
+                and all(isinstance(c, dict) and self._s(c.get("text")) for c in choices)
+            ):
+                raise ContentImportError(f"{loc}: question choices must be a list of objects with a text")
+        return rec
+
+    @staticmethod
+    def _s(value):
+        return (value or "").strip() if isinstance(value, str) or value is None else str(value)
+
+    def _course_ids(self, titles):
+        return dict(Course.objects.filter(title__in=set(titles)).values_list("title", "id"))
+
+    def _topic_ids(self, pairs):
+        """{(course title, topic title): topic_id} for the given pairs, one query."""
+        # Two IN lists instead of an OR per pair (SQLite caps expression depth);
+        # the superset is narrowed in Python.
+        pairs = set(pairs)
+        rows = Topic.objects.filter(
+            course__title__in={c for c, _ in pairs}, title__in={t for _, t in pairs}
+        ).values_list("course__title", "title", "id")
+        return {(c, t): i for c, t, i in rows if (c, t) in pairs}
+
+    def _resolve_topics(self, rows):
+        keys = [(self._s(r["course"]), self._s(r["topic"])) for _, r in rows]
+        ids = self._topic_ids(keys)
+        for key, (loc, _) in zip(keys, rows):
+            if key not in ids:
+                raise ContentImportError(f"{loc}: unknown topic {key[1]!r} in course {key[0]!r}")
+        return keys, ids
+
+    # ---- writers ----
+    def _write_courses(self, rows):
+        latest = {}
+        for _, r in rows:
+            latest[self._s(r["title"])] = self._s(r.get("description"))
+
+        existing = {c.title: c for c in Course.objects.filter(title__in=latest.keys())}
+        to_update = []
+        for title, desc in latest.items():
+            c = existing.get(title)
+            if c and c.description != desc:
+                c.description = desc
+                to_update.append(c)
+        Course.objects.bulk_create(
+            [Course(title=t, description=d) for t, d in latest.items() if t not in existing]
+        )
+        if to_update:
+            Course.objects.bulk_update(to_update, ["description"])
+
+    def _write_topics(self, rows):
+        course_ids = self._course_ids(self._s(r["course"]) for _, r in rows)
+        objs = {}
+        for loc, r in rows:
+            course = self._s(r["course"])
+            if course not in course_ids:
+                raise ContentImportError(f"{loc}: unknown course {course!r}")
+            key = (course_ids[course], self._s(r["title"]))
+            objs[key] = Topic(course_id=key[0], title=key[1], summary=self._s(r.get("summary")))
+        Topic.objects.bulk_create(
+            objs.values(),
+            update_conflicts=True,
+            unique_fields=["course", "title"],
+            update_fields=["summary"],
+        )
+
+    def _write_lessons(self, rows):
+        keys, topic_ids = self._resolve_topics(rows)
+        objs = {}
+        for key, (_, r) in zip(keys, rows):
+            topic_id = topic_ids[key]
+            order = r["order"]
+            objs[(topic_id, order)] = Lesson(
+                topic_id=topic_id, order=order,
+                title=self._s(r["title"]), content=r.get("content") or "",
+            )
+        Lesson.objects.bulk_create(
+            objs.values(),
+            update_conflicts=True,
+            unique_fields=["topic", "order"],
+            update_fields=["title", "content"],
+        )
+
+    def _write_questions(self, rows):
+        keys, topic_ids = self._resolve_topics(rows)
+        incoming = {}
+        for key, (_, r) in zip(keys, rows):
+            incoming[(topic_ids[key], self._s(r["text"]))] = r
+
+        existing = {
+            (q.topic_id, q.text): q
+            for q in QuizQuestion.objects.filter(
+                topic_id__in={t for t, _ in incoming}, text__in={x for _, x in incoming}
+            )
+            if (q.topic_id, q.text) in incoming
+        }
+
+        new, changed, resynced = [], [], []
+        for (topic_id, text), r in incoming.items():
+            difficulty = self._s(r.get("difficulty")) or "easy"
+            explanation = self._s(r.get("explanation"))
+            q = existing.get((topic_id, text))
+            if q is None:
+                if self.deduper:
+                    hit = self.deduper.check(topic_id, text, key=text)
+                    if hit:
+                        self.duplicates.append((topic_id, text, hit[0], hit[1]))
+                        if self.skip_duplicates:
+                            continue
+                new.append(QuizQuestion(topic_id=topic_id, text=text, difficulty=difficulty, explanation=explanation))
+            else:
+                if (q.difficulty, q.explanation) != (difficulty, explanation):
+                    q.difficulty, q.explanation = difficulty, explanation
+                    changed.append(q)
+                if r.get("choices") is not None:
+                    resynced.append((q, r["choices"]))
+
+        if changed:
+            QuizQuestion.objects.bulk_update(changed, ["difficulty", "explanation"])
+        if resynced:
+            self._sync_choices(resynced)
+        if not new:
+            return
+
+        QuizQuestion.objects.bulk_create(new)
+        if any(q.pk is None for q in new):
+            # Backend could not return ids from bulk_create; look them up.
+            ids = {
+                (t, x): i for t, x, i in QuizQuestion.objects.filter(
+                    topic_id__in={q.topic_id for q in new}, text__in={q.text for q in new}
+                ).values_list("topic_id", "text", "id")
+            }
+            for q in new:
+                q.pk = ids[(q.topic_id, q.text)]
+
+        choices = []
+        for q in new:
+            for c in incoming[(q.topic_id, q.text)].get("choices") or []:
+                choices.append(QuizChoice(
+                    question_id=q.pk, text=self._s(c.get("text"))[:255], is_correct=bool(c.get("correct")),
+                ))
+        QuizChoice.objects.bulk_create(choices)
+
+    def _sync_choices(self, pairs):
+        """
+        Make the stored choices of existing questions match their records:
+        matched by text, `is_correct` is updated, new texts are added and
+        texts no longer listed are deleted.
+        """
+        stored = defaultdict(dict)
+        to_delete = []
+        for c in QuizChoice.objects.filter(question_id__in={q.pk for q, _ in pairs}):
+            if c.text in stored[c.question_id]:
+                to_delete.append(c.pk)  # same text twice: keep the first
+            else:
+                stored[c.question_id][c.text] = c
+
+        to_create, to_update = [], []
+        for q, choices in pairs:
+            have = stored[q.pk]
+            want = {self._s(c.get("text"))[:255]: bool(c.get("correct")) for c in choices}
+            for text, correct in want.items():
+                c = have.get(text)
+                if c is None:
+                    to_create.append(QuizChoice(question_id=q.pk, text=text, is_correct=correct))
+                elif c.is_correct != correct:
+                    c.is_correct = correct
+                    to_update.append(c)
+            to_delete.extend(c.pk for text, c in have.items() if text not in want)
+
+        if to_delete:
+            QuizChoice.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            QuizChoice.objects.bulk_update(to_update, ["is_correct"])
+        QuizChoice.objects.bulk_create(to_create)
+
+
+def import_files(paths, record_type=None, batch_size=DEFAULT_BATCH_SIZE, **importer_opts):
+    """Import several files through one importer. Returns the importer."""
+    importer = ContentImporter(batch_size=batch_size, **importer_opts)
+    for path in paths:
+        for loc, rec in read_records(path, record_type=record_type):
+            importer.add(rec, loc)
+    importer.flush()
+    return importer
@@ -0,0 +1,54 @@
+# core/jsonrender.py
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:  # optional: 3-10x faster than the stdlib encoder and emits bytes directly
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# ======================
+# JSON rendering
+# ======================
+
+CONTENT_TYPE = "application/json"
+
+_django_default = DjangoJSONEncoder().default
+_stdlib = json.JSONEncoder(default=_django_default, ensure_ascii=False, separators=(",", ":"))
+
+if orjson is not None:
+    # Datetimes are passed through to DjangoJSONEncoder: orjson would write
+    # microseconds and "+00:00" where Django writes milliseconds and "Z".
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(obj):
+        """
+        Serialize to UTF-8 JSON bytes. Types orjson lacks (Decimal, lazy
+        strings, datetimes, ...) go through DjangoJSONEncoder, and payloads
+        orjson rejects (integers beyond 64 bits) fall back to the stdlib
+        encoder. Unlike the stdlib, NaN and Infinity are written as null.
+        """
+        try:
+            return orjson.dumps(obj, default=_django_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return _stdlib.encode(obj).encode("utf-8")
+else:
+    def dumps(obj):
+        """Serialize to UTF-8 JSON bytes with the stdlib encoder (DjangoJSONEncoder semantics)."""
+        return _stdlib.encode(obj).encode("utf-8")
+
+
+class JSONResponse(HttpResponse):
+    """HttpResponse whose body is `data` rendered by `dumps`."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", CONTENT_TYPE)
+        super().__init__(dumps(data), **kwargs)
+
+
+def raw_response(content, status=200, content_type=CONTENT_TYPE):
+    """Send pre-serialized JSON bytes (e.g. a cached payload) as-is."""
+    return HttpResponse(content, status=status, content_type=content_type)
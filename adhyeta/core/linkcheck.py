@@ -0,0 +1,136 @@
+# core/linkcheck.py
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit
+
+
+# ======================
+# Resource link health
+# ======================
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_REDIRECTS = 5
+
+
+@dataclass
+class LinkResult:
+    status: int | None  # final HTTP status, None if unreachable
+    latency_ms: int | None
+    error: str = ""
+
+    @property
+    def is_dead(self) -> bool:
+        return self.status is None or self.status >= 400
+
+
+class LinkChecker:
+    """
+    HEAD-checks URLs from a bounded thread pool.
+
+    - At most `per_host` requests are in flight to any one host.
+    - Each worker thread keeps one keep-alive connection per host.
+    - Connection errors and 429/5xx responses are retried with backoff.
+    - Servers that reject HEAD (405/501) are re-checked with GET.
+    """
+
+    def __init__(self, workers=16, per_host=4, timeout=10.0, retries=2, backoff=0.5,
+                 user_agent="AdhyetaLinkChecker/1.0"):
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.user_agent = user_agent
+        self._host_limits = {}
+        self._host_lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---- pool plumbing ----
+    def _host_slot(self, netloc):
+        with self._host_lock:
+            sem = self._host_limits.get(netloc)
+            if sem is None:
+                sem = self._host_limits[netloc] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def _connection(self, scheme, netloc):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        key = (scheme, netloc)
+        conn = conns.get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conns[key] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self, scheme, netloc):
+        conn = getattr(self._local, "conns", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(self, method, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"unsupported URL: {url!r}")
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        with self._host_slot(parts.netloc):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, headers={"User-Agent": self.user_agent})
+                resp = conn.getresponse()
+                # Drain the body so the connection can be reused.
+                resp.read()
+            except Exception:
+                self._drop_connection(parts.scheme, parts.netloc)
+                raise
+            if resp.will_close:
+                self._drop_connection(parts.scheme, parts.netloc)
+        return resp.status, resp.getheader("Location")
+
+    def _fetch(self, url):
+        method = "HEAD"
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = self._request(method, url)
+            if status in (405, 501) and method == "HEAD":
+                method = "GET"
+                continue
+            if 300 <= status < 400 and location:
+                url = urljoin(url, location)
+                continue
+            return status
+        return status
+
+    # ---- public API ----
+    def check(self, url) -> LinkResult:
+        error = ""
+        status = None
+        started = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            started = time.perf_counter()
+            try:
+                status = self._fetch(url)
+            except ValueError as e:
+                return LinkResult(status=None, latency_ms=None, error=str(e))
+            except (OSError, http.client.HTTPException) as e:
+                status, error = None, f"{type(e).__name__}: {e}"
+                continue
+            error = ""
+            if status not in RETRY_STATUSES:
+                break
+        latency = int((time.perf_counter() - started) * 1000)
+        return LinkResult(status=status, latency_ms=latency if status else None, error=error)
+
+    def check_many(self, urls) -> dict:
+        """Check each distinct URL once. Returns {url: LinkResult}."""
+        unique = list(dict.fromkeys(u for u in urls if u))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return dict(zip(unique, pool.map(self.check, unique)))
@@ -0,0 +1,161 @@
+# core/linkstub.py
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .linkcheck import MAX_REDIRECTS, LinkChecker
+
+
+# ======================
+# Local stub server for LinkChecker
+# ======================
+
+class StubServer:
+    """
+    Keep-alive HTTP/1.1 server on 127.0.0.1 and an ephemeral port.
+
+    Routes:
+      /ok               200
+      /dead             404
+      /head-405         405 for HEAD, 200 for GET
+      /redirect/<n>     n hops of 302, then /ok
+      /loop             302 to itself forever
+      /flaky/<n>/<key>  503 for the first n hits of <key>, then 200
+      /slow/<key>       200 after `slow_s`; records peak concurrency
+    """
+
+    def __init__(self, slow_s=0.1):
+        self.slow_s = slow_s
+        self.hits = defaultdict(int)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self._route(send_body=False)
+
+            def do_GET(self):
+                self._route(send_body=True)
+
+            def _reply(self, status, send_body, location=None):
+                body = b"stub\n" if send_body else b""
+                self.send_response(status)
+                if location:
+                    self.send_header("Location", location)
+                self.send_header("Content-Length", str(len(body) if send_body else 5))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def _route(self, send_body):
+                parts = self.path.strip("/").split("/")
+                with stub._lock:
+                    stub.hits[self.path] += 1
+                    hits = stub.hits[self.path]
+
+                if parts[0] == "ok":
+                    self._reply(200, send_body)
+                elif parts[0] == "dead":
+                    self._reply(404, send_body)
+                elif parts[0] == "head-405":
+                    self._reply(200 if self.command == "GET" else 405, send_body)
+                elif parts[0] == "redirect":
+                    left = int(parts[1])
+                    self._reply(302, send_body, "/ok" if left <= 1 else f"/redirect/{left - 1}")
+                elif parts[0] == "loop":
+                    self._reply(302, send_body, "/loop")
+                elif parts[0] == "flaky":
+                    self._reply(503 if hits <= int(parts[1]) else 200, send_body)
+                elif parts[0] == "slow":
+                    with stub._lock:
+                        stub.in_flight += 1
+                        stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                    try:
+                        time.sleep(stub.slow_s)
+                    finally:
+                        with stub._lock:
+                            stub.in_flight -= 1
+                    self._reply(200, send_body)
+                else:
+                    self._reply(404, send_body)
+
+        return Handler
+
+
+def self_test(per_host=3, write=print):
+    """
+    Run LinkChecker against a StubServer: retries, redirects, HEAD fallback
+    and the per-host concurrency cap. Returns the list of failed checks.
+    """
+    failures = []
+
+    def expect(name, ok, detail=""):
+        write(f"{'ok' if ok else 'FAIL':5} {name}{f' ({detail})' if detail and not ok else ''}")
+        if not ok:
+            failures.append(name)
+
+    with StubServer() as stub:
+        checker = LinkChecker(workers=per_host * 3, per_host=per_host, timeout=5, retries=2, backoff=0.01)
+
+        r = checker.check(stub.url("/ok"))
+        expect("200 is alive", r.status == 200 and not r.is_dead and r.latency_ms is not None, r)
+        r = checker.check(stub.url("/dead"))
+        expect("404 is dead, not retried", r.is_dead and stub.hits["/dead"] == 1, f"{r}, hits={stub.hits['/dead']}")
+        r = checker.check(stub.url("/head-405"))
+        expect("HEAD 405 falls back to GET", r.status == 200, r)
+
+        r = checker.check(stub.url("/flaky/2/a"))
+        expect("503 retried until 200", r.status == 200 and stub.hits["/flaky/2/a"] == 3,
+               f"{r}, hits={stub.hits['/flaky/2/a']}")
+        r = checker.check(stub.url("/flaky/9/b"))
+        expect("retries are bounded", r.status == 503 and stub.hits["/flaky/9/b"] == checker.retries + 1,
+               f"{r}, hits={stub.hits['/flaky/9/b']}")
+
+        r = checker.check(stub.url(f"/redirect/{MAX_REDIRECTS}"))
+        expect("redirect chain is followed", r.status == 200, r)
+        r = checker.check(stub.url("/loop"))
+        expect("redirect loop stops", r.status == 302 and stub.hits["/loop"] == MAX_REDIRECTS + 1,
+               f"{r}, hits={stub.hits['/loop']}")
+
+        dead_port = LinkChecker(timeout=1, retries=1, backoff=0.01).check("http://127.0.0.1:1/")
+        expect("connection errors are reported", dead_port.status is None and dead_port.error, dead_port)
+
+        urls = [stub.url(f"/slow/{i}") for i in range(per_host * 5)]
+        results = checker.check_many(urls + urls[:3])
+        expect("check_many de-duplicates", len(results) == len(urls), len(results))
+        expect("all concurrent checks succeed", all(r.status == 200 for r in results.values()))
+        expect(f"at most {per_host} in flight per host", stub.peak_in_flight <= per_host, stub.peak_in_flight)
+        expect("host slots fill up to the cap", stub.peak_in_flight == per_host, stub.peak_in_flight)
+
+    return failures
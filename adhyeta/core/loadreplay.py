@@ -0,0 +1,316 @@
+# core/loadreplay.py
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from .benchdata import BENCH_PASSWORD, bench_username
+
+
+# ======================
+# Minimal keep-alive HTTP/1.1 client (asyncio streams)
+# ======================
+
+class HttpError(Exception):
+    pass
+
+
+class HttpSession:
+    """
+    One virtual user: a single keep-alive connection plus a cookie jar.
+    Sends X-CSRFToken from the csrftoken cookie like static/js/app.js does.
+    """
+
+    def __init__(self, base_url, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("only http:// targets are supported (local runserver/gunicorn)")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.cookies = {}
+        self._reader = self._writer = None
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._reader = self._writer = None
+
+    async def request(self, method, path, params=None, body=None):
+        """Returns (status, body bytes). Reconnects once if the server closed the connection."""
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = {
+            "Host": f"{self.host}:{self.port}",
+            "Connection": "keep-alive",
+            "Accept": "application/json",
+            "Content-Length": str(len(payload)),
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        if "csrftoken" in self.cookies and method != "GET":
+            headers["X-CSRFToken"] = self.cookies["csrftoken"]
+        raw = (
+            f"{method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        ).encode() + payload
+
+        for attempt in (0, 1):
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+            try:
+                self._writer.write(raw)
+                await self._writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                if attempt:
+                    raise HttpError(f"connection failed: {e}") from e
+
+    async def _read_response(self):
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = []
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers.append((name.strip().lower(), value.strip()))
+
+        h = dict(headers)
+        if h.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            data = b"".join(chunks)
+        elif "content-length" in h:
+            data = await self._reader.readexactly(int(h["content-length"]))
+        else:
+            data = await self._reader.read()
+            await self.close()
+
+        for name, value in headers:
+            if name == "set-cookie":
+                key, _, rest = value.partition("=")
+                val = rest.split(";", 1)[0]
+                if val and "max-age=0" not in value.lower():
+                    self.cookies[key.strip()] = val
+                else:
+                    self.cookies.pop(key.strip(), None)
+        if h.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+
+# ======================
+# Scenario mix
+# ======================
+
+DEFAULT_SCENARIO = {
+    "weights": {"browse": 6, "mark_lesson": 3, "quiz": 2, "chat": 1},
+    "think_time_ms": [50, 250],  # uniform pause between actions
+    "users": 1000,               # bench-000000 … bench-000999 (core.benchdata)
+}
+
+
+def load_scenario(path=None):
+    """DEFAULT_SCENARIO, overridden by the keys of a JSON file."""
+    scenario = {**DEFAULT_SCENARIO, "weights": dict(DEFAULT_SCENARIO["weights"])}
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        scenario.update({k: v for k, v in data.items() if k != "weights"})
+        scenario["weights"].update(data.get("weights") or {})
+    unknown = set(scenario["weights"]) - set(ACTIONS)
+    if unknown:
+        raise ValueError(f"unknown actions in scenario: {sorted(unknown)}; known: {sorted(ACTIONS)}")
+    return scenario
+
+
+class Stats:
+    """Latency samples and outcome counts per endpoint and per action."""
+
+    def __init__(self):
+        self.latency = defaultdict(list)   # endpoint -> [ms]
+        self.outcomes = defaultdict(lambda: defaultdict(int))  # endpoint -> outcome -> n
+        self.actions = defaultdict(lambda: defaultdict(int))   # action -> ok/failed -> n
+
+    def record(self, endpoint, ms, outcome):
+        self.latency[endpoint].append(ms)
+        self.outcomes[endpoint][outcome] += 1
+
+    def report(self, elapsed):
+        def pct(values, p):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+        endpoints = {}
+        for endpoint, values in sorted(self.latency.items()):
+            outcomes = dict(self.outcomes[endpoint])
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "outcomes": outcomes,
+                "error_rate": round(1 - outcomes.get("ok", 0) / len(values), 4),
+                "p50_ms": round(pct(values, 50), 2),
+                "p95_ms": round(pct(values, 95), 2),
+                "p99_ms": round(pct(values, 99), 2),
+                "max_ms": round(max(values), 2),
+            }
+        total = sum(len(v) for v in self.latency.values())
+        all_values = [ms for v in self.latency.values() for ms in v]
+        counts = defaultdict(int)
+        for o in self.outcomes.values():
+            for k, n in o.items():
+                counts[k] += n
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0,
+            "outcomes": dict(counts),
+            "error_rate": round(1 - counts.get("ok", 0) / total, 4) if total else 0,
+            "lock_error_rate": round(counts.get("db_locked", 0) / total, 4) if total else 0,
+            "p50_ms": round(pct(all_values, 50), 2) if all_values else None,
+            "p95_ms": round(pct(all_values, 95), 2) if all_values else None,
+            "p99_ms": round(pct(all_values, 99), 2) if all_values else None,
+            "actions": {k: dict(v) for k, v in sorted(self.actions.items())},
+            "endpoints": endpoints,
+        }
+
+
+def classify(status, body):
+    if status < 400:
+        return "ok"
+    if status >= 500 and b"database is locked" in body:
+        return "db_locked"  # visible when the server runs with DEBUG (the error page names it)
+    return f"http_{status}"
+
+
+class VirtualUser:
+    def __init__(self, index, base_url, scenario, stats, rng):
+        self.index = index
+        self.session = HttpSession(base_url)
+        self.scenario = scenario
+        self.stats = stats
+        self.rng = rng
+        self.lessons = []
+
+    async def call(self, endpoint, method, path, params=None, body=None):
+        start = time.perf_counter()
+        try:
+            status, data = await self.session.request(method, path, params, body)
+        except (HttpError, OSError, asyncio.TimeoutError) as e:
+            await self.session.close()  # the connection state is unknown
+            self.stats.record(endpoint, (time.perf_counter() - start) * 1000, type(e).__name__)
+            return None
+        ms = (time.perf_counter() - start) * 1000
+        outcome = classify(status, data)
+        self.stats.record(endpoint, ms, outcome)
+        if outcome != "ok":
+            return None
+        try:
+            return json.loads(data or b"{}").get("data", {})
+        except ValueError:
+            return {}
+
+    async def login(self):
+        await self.call("index", "GET", "/")  # csrftoken cookie
+        username = bench_username(self.index % self.scenario["users"])
+        return await self.call("api_login", "POST", "/api/login", body={"email": username, "password": BENCH_PASSWORD})
+
+    async def run(self, deadline):
+        try:
+            if await self.login() is None:
+                self.stats.actions["login"]["failed"] += 1
+                return
+            self.stats.actions["login"]["ok"] += 1
+            names = list(self.scenario["weights"])
+            weights = [self.scenario["weights"][n] for n in names]
+            lo, hi = self.scenario["think_time_ms"]
+            while time.monotonic() < deadline:
+                action = self.rng.choices(names, weights)[0]
+                ok = await ACTIONS[action](self)
+                self.stats.actions[action]["ok" if ok else "failed"] += 1
+                await asyncio.sleep(self.rng.uniform(lo, hi) / 1000)
+        finally:
+            await self.session.close()
+
+
+# ---- actions: each returns True when every step succeeded ----
+
+async def browse(vu):
+    data = await vu.call("api_courses", "GET", "/api/courses")
+    if not data or not data.get("courses"):
+        return False
+    course = vu.rng.choice(data["courses"])
+    data = await vu.call("api_topics", "GET", "/api/topics", {"course_id": course["id"]})
+    if not data or not data.get("topics"):
+        return False
+    topic = vu.rng.choice(data["topics"])
+    data = await vu.call("api_lessons", "GET", "/api/lessons", {"topic_id": topic["id"]})
+    if data is None:
+        return False
+    vu.lessons = [l["id"] for l in data.get("lessons", [])] or vu.lessons
+    return True
+
+
+async def mark_lesson(vu):
+    if not vu.lessons and not await browse(vu):
+        return False
+    lesson_id = vu.rng.choice(vu.lessons)
+    return await vu.call("api_mark_lesson", "POST", "/api/mark-lesson", body={"lesson_id": lesson_id}) is not None
+
+
+async def quiz(vu):
+    data = await vu.call("api_quiz_generate", "GET", "/api/quiz/generate", {"count": 6})
+    if not data or not data.get("questions"):
+        return False
+    answers = [
+        {"question_id": q["id"], "choice_id": vu.rng.choice(q["choices"])["id"]}
+        for q in data["questions"] if q.get("choices")
+    ]
+    return await vu.call("api_quiz_submit", "POST", "/api/quiz/submit", body={"answers": answers}) is not None
+
+
+async def chat(vu):
+    data = await vu.call("api_ai_start", "POST", "/api/ai/start", body={})
+    if not data:
+        return False
+    return await vu.call(
+        "api_ai_message", "POST", "/api/ai/message",
+        body={"thread_id": data["thread_id"], "message": vu.rng.choice(["next lesson", "my progress", "arrays"])},
+    ) is not None
+
+
+ACTIONS = {"browse": browse, "mark_lesson": mark_lesson, "quiz": quiz, "chat": chat}
+
+
+async def replay(base_url, scenario, concurrency, duration, ramp_up=0.0, seed=68):
+    """Run `concurrency` virtual users for `duration` seconds; returns the report dict."""
+    stats = Stats()
+    start = time.monotonic()
+    deadline = start + duration
+
+    async def user(i):
+        if ramp_up:
+            await asyncio.sleep(ramp_up * i / concurrency)
+        await VirtualUser(i, base_url, scenario, stats, random.Random(seed + i)).run(deadline)
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    report = stats.report(time.monotonic() - start)
+    report.update({"target": base_url, "concurrency": concurrency, "duration_s": duration, "scenario": scenario})
+    return report
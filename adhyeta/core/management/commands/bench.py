@@ -0,0 +1,243 @@
+import contextlib
+import io
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core import urls as core_urls
+from core.benchdata import BENCH_PASSWORD, SCALES, bench_username, dataset_present, generate_dataset
+from core.models import AssistantThread, Course, Exam, Lesson, QuizChoice, QuizQuestion, Topic
+from core.utils import create_otp_for_user
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _scenarios(ctx):
+    """
+    url name -> (method, query-or-body, logged_in, mutates). Bodies are
+    built per call so every iteration gets fresh values. Mutating requests
+    run inside a rolled-back transaction so the dataset stays identical; a
+    body given as a callable is built inside that transaction too, so setup
+    such as issuing an OTP is rolled back with the request.
+    """
+    email = ctx["email"]
+    return {
+        "index": lambda: ("GET", {}, False, False),
+        "api_signup": lambda: ("POST", {
+            "student_name": "Bench Signup", "email": f"bench-signup-{time.perf_counter_ns()}@example.com",
+            "phone": "9800000000", "password": "bench-pass-123", "student_type": "school",
+        }, False, True),
+        "api_login": lambda: ("POST", {"email": email, "password": BENCH_PASSWORD}, False, True),
+        "api_logout": lambda: ("POST", {}, True, True),
+        "api_me": lambda: ("GET", {}, True, False),
+        "api_forgot_password": lambda: ("POST", {"email": email}, False, True),
+        "api_verify_otp": lambda: ("POST", lambda: {"email": email, "code": ctx["otp"]()}, False, True),
+        "api_reset_password": lambda: ("POST", lambda: {
+            "email": email, "code": ctx["otp"](), "new_password": BENCH_PASSWORD,
+        }, False, True),
+        "api_courses": lambda: ("GET", {}, False, False),
+        "api_topics": lambda: ("GET", {"course_id": ctx["course_id"]}, False, False),
+        "api_lessons": lambda: ("GET", {"topic_id": ctx["topic_id"]}, True, False),
+        "api_mark_lesson": lambda: ("POST", {"lesson_id": ctx["lesson_id"]}, True, True),
+        "api_my_progress": lambda: ("GET", {}, True, False),
+        "api_seed_demo": lambda: ("POST", {}, False, True),
+        "api_progress_weekly": lambda: ("GET", {}, True, False),
+        "api_quiz_generate": lambda: ("GET", {"count": 6}, True, False),
+        "api_quiz_submit": lambda: ("POST", {"answers": ctx["answers"], "source": "bench"}, True, True),
+        "api_quiz_history": lambda: ("GET", {}, True, False),
+        "api_quiz_seed": lambda: ("POST", {}, False, True),
+        "api_resources_search": lambda: ("GET", {"q": "graph", "exam_slug": ctx["exam_slug"]}, False, False),
+        "api_weightage_trends": lambda: ("GET", {"exam_slug": ctx["exam_slug"]}, False, False),
+        "api_ai_start": lambda: ("POST", {}, True, True),
+        "api_ai_message": lambda: ("POST", {"thread_id": ctx["thread_id"], "message": "next lesson"}, True, True),
+        "metrics": lambda: ("GET", {}, False, False),
+    }
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=settings.BASE_DIR, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every core/urls.py endpoint through the test client on a deterministic "
+        "synthetic dataset. Use a scratch database, e.g. "
+        "SQLITE_PATH=/tmp/bench.sqlite3 manage.py migrate && SQLITE_PATH=/tmp/bench.sqlite3 manage.py bench"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=SCALES, default="small")
+        parser.add_argument("--seed", type=int, default=68)
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--only", nargs="*", help="URL names to run (default: all).")
+        parser.add_argument("--output", help="Write the JSON report here (default: stdout table only).")
+        parser.add_argument("--skip-generate", action="store_true", help="Fail instead of generating data.")
+
+    def handle(self, *args, **opts):
+        scale = opts["scale"]
+        if not dataset_present(scale):
+            if opts["skip_generate"]:
+                raise CommandError(f"No {scale!r} dataset in this database.")
+            if User.objects.exclude(username__startswith="bench-").exists():
+                self.stderr.write(self.style.WARNING("Database has non-bench users; generating alongside them."))
+            t0 = time.perf_counter()
+            counts = generate_dataset(scale, seed=opts["seed"], log=lambda m: self.stdout.write(f"  {m}"))
+            self.stdout.write(f"Generated {scale} dataset in {time.perf_counter() - t0:.1f}s: {counts}")
+
+        ctx = self._context()
+        scenarios = _scenarios(ctx)
+        names = [p.name for p in core_urls.urlpatterns if p.name]
+        missing = [n for n in names if n not in scenarios]
+        if missing:
+            self.stderr.write(self.style.WARNING(f"No bench scenario for: {', '.join(missing)}"))
+        if opts["only"]:
+            names = [n for n in names if n in opts["only"]]
+
+        # Per-request warnings would drown the table.
+        for logger in ("core.perf", "django.request"):
+            logging.getLogger(logger).setLevel(logging.CRITICAL)
+        caches["default"].clear()
+        anon, authed = Client(raise_request_exception=False), Client(raise_request_exception=False)
+        authed.force_login(ctx["user"])
+
+        results = {}
+        self.stdout.write(f"{'endpoint':<24}{'status':>7}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'peak KiB':>10}")
+        for name in names:
+            if name not in scenarios:
+                continue
+            spec = scenarios[name]
+            path = reverse(name)
+            timings, queries, statuses = [], [], {}
+            for i in range(opts["warmup"] + opts["iterations"]):
+                method, data, logged_in, mutates = spec()
+                client = authed if logged_in else anon
+                elapsed, response = self._request(client, method, path, data, mutates)
+                if name == "api_logout":
+                    authed.force_login(ctx["user"])
+                if i < opts["warmup"]:
+                    continue
+                timings.append(elapsed)
+                stats = getattr(response.wsgi_request, "query_stats", None)
+                queries.append(stats.count if stats else 0)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            method, data, logged_in, mutates = spec()
+            tracemalloc.start()
+            self._request(authed if logged_in else anon, method, path, data, mutates)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            if name == "api_logout":
+                authed.force_login(ctx["user"])
+
+            results[name] = {
+                "method": method,
+                "path": path,
+                "iterations": len(timings),
+                "status": statuses,
+                "p50_ms": round(_percentile(timings, 50), 3),
+                "p95_ms": round(_percentile(timings, 95), 3),
+                "mean_ms": round(statistics.fmean(timings), 3),
+                "max_ms": round(max(timings), 3),
+                "queries_median": statistics.median(queries),
+                "queries_max": max(queries),
+                "peak_alloc_kib": round(peak / 1024, 1),
+            }
+            r = results[name]
+            status = ",".join(str(s) for s in sorted(statuses))
+            self.stdout.write(
+                f"{name:<24}{status:>7}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['queries_median']:>9}{r['peak_alloc_kib']:>10.1f}"
+            )
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "created_at": timezone.now().isoformat(),
+                "scale": scale,
+                "seed": opts["seed"],
+                "iterations": opts["iterations"],
+                "db_vendor": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "cache": settings.CACHES["shared"]["BACKEND"],
+            },
+            "endpoints": results,
+        }
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {opts['output']}"))
+
+    def _request(self, client, method, path, data, mutates):
+        call = client.post if method == "POST" else client.get
+
+        def request_kwargs():
+            body = data() if callable(data) else data
+            return {"data": json.dumps(body), "content_type": "application/json"} if method == "POST" else {"data": body}
+
+        if not mutates:
+            kwargs = request_kwargs()
+            start = time.perf_counter()
+            response = call(path, **kwargs)
+            return (time.perf_counter() - start) * 1000, response
+        try:
+            with transaction.atomic():
+                kwargs = request_kwargs()
+                start = time.perf_counter()
+                response = call(path, **kwargs)
+                elapsed = (time.perf_counter() - start) * 1000
+                raise _Rollback
+        except _Rollback:
+            pass
+        return elapsed, response
+
+    def _context(self):
+        user = User.objects.get(username=bench_username(0))
+        course = Course.objects.filter(title__startswith="bench-").order_by("title").first()
+        topic = Topic.objects.filter(course=course).order_by("title").first()
+        lesson = Lesson.objects.filter(topic=topic).order_by("order").first()
+        exam = Exam.objects.get(slug="bench-exam")
+        questions = list(QuizQuestion.objects.filter(topic=topic).order_by("id")[:6])
+        answers = [
+            {"question_id": q.id, "choice_id": QuizChoice.objects.filter(question=q).order_by("id").first().id}
+            for q in questions
+        ]
+        thread, _ = AssistantThread.objects.get_or_create(user=user, is_active=True)
+
+        def otp():
+            with contextlib.redirect_stdout(io.StringIO()):  # create_otp_for_user prints the code
+                return create_otp_for_user(user)
+
+        return {
+            "user": user, "email": user.username, "course_id": course.id, "topic_id": topic.id,
+            "lesson_id": lesson.id, "exam_slug": exam.slug, "answers": answers, "thread_id": thread.id,
+            "otp": otp,
+        }
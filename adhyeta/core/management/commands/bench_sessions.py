@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import StudentProfile
+
+
+# (method, path, json body) — a typical signed-in student session
+API_MIX = [
+    ("get", "/api/me", None),
+    ("get", "/api/courses", None),
+    ("get", "/api/my-progress", None),
+    ("get", "/api/progress-weekly", None),
+    ("get", "/api/quiz/history", None),
+    ("post", "/api/logout", {}),
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request latency and django_session queries for each SESSION_BACKEND option."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=50, help="Login + API mix repetitions per engine.")
+        parser.add_argument(
+            "--engines", default=",".join(settings.SESSION_ENGINES),
+            help="Comma-separated SESSION_BACKEND names to compare.",
+        )
+
+    def handle(self, *args, **opts):
+        names = [n for n in opts["engines"].split(",") if n]
+        unknown = [n for n in names if n not in settings.SESSION_ENGINES]
+        if unknown:
+            raise CommandError(f"Unknown engine(s) {', '.join(unknown)}; expected: {', '.join(settings.SESSION_ENGINES)}")
+        self.stdout.write(
+            f"{'engine':<16}{'p50 ms':>9}{'p95 ms':>9}{'queries/req':>13}{'session q/req':>15}"
+        )
+        with transaction.atomic():
+            user = User.objects.create_user("bench-session", email="bench-session@example.com", password="x")
+            StudentProfile.objects.create(user=user)
+            for name in names:
+                with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[name]):
+                    self._run(name, user, opts["rounds"])
+            transaction.set_rollback(True)
+
+    def _run(self, name, user, rounds):
+        latencies, queries, session_queries, requests = [], 0, 0, 0
+        for _ in range(rounds):
+            client = Client()
+            client.force_login(user)
+            for method, path, body in API_MIX:
+                kwargs = {"data": body, "content_type": "application/json"} if body is not None else {}
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    getattr(client, method)(path, **kwargs)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                requests += 1
+                queries += len(ctx.captured_queries)
+                session_queries += sum("django_session" in q["sql"] for q in ctx.captured_queries)
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f"{name:<16}{statistics.median(latencies):>9.2f}{p95:>9.2f}"
+            f"{queries / requests:>13.2f}{session_queries / requests:>15.2f}"
+        )
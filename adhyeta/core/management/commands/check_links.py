@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.linkcheck import LinkChecker
+from core.linkstub import self_test
+from core.models import Resource
+
+
+class Command(BaseCommand):
+    help = "HEAD-check Resource.url / solution_url and store status + latency per resource."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=16, help="Thread pool size.")
+        parser.add_argument("--per-host", type=int, default=4, help="Max concurrent requests per host.")
+        parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout (seconds).")
+        parser.add_argument("--retries", type=int, default=2, help="Retries on connection errors / 429 / 5xx.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Resources checked and saved per batch.")
+        parser.add_argument(
+            "--stale-hours", type=float, default=0,
+            help="Only re-check resources not checked within this many hours (0 = check all).",
+        )
+        parser.add_argument(
+            "--self-test", action="store_true",
+            help="Check the checker against a local stub HTTP server instead of the Resource table.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["self_test"]:
+            failures = self_test(per_host=opts["per_host"], write=self.stdout.write)
+            if failures:
+                raise CommandError(f"{len(failures)} link checker self-test(s) failed: {', '.join(failures)}")
+            self.stdout.write(self.style.SUCCESS("Link checker self-test passed."))
+            return
+
+        checker = LinkChecker(
+            workers=opts["workers"],
+            per_host=opts["per_host"],
+            timeout=opts["timeout"],
+            retries=opts["retries"],
+        )
+
+        qs = Resource.objects.order_by("id")
+        if opts["stale_hours"]:
+            cutoff = timezone.now() - timedelta(hours=opts["stale_hours"])
+            qs = qs.filter(link_checked_at__isnull=True) | qs.filter(link_checked_at__lt=cutoff)
+        qs = qs.only("id", "url", "solution_url")
+
+        checked = dead = 0
+        batch = []
+        for res in qs.iterator(chunk_size=opts["batch_size"]):
+            batch.append(res)
+            if len(batch) >= opts["batch_size"]:
+                dead += self._check_batch(checker, batch)
+                checked += len(batch)
+                batch = []
+        if batch:
+            dead += self._check_batch(checker, batch)
+            checked += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} resources, {dead} dead."))
+
+    def _check_batch(self, checker, batch):
+        results = checker.check_many([r.url for r in batch] + [r.solution_url for r in batch])
+        now = timezone.now()
+        dead = 0
+        for r in batch:
+            main = results[r.url] if r.url else None
+            sol = results.get(r.solution_url) if r.solution_url else None
+            r.url_status = main.status if main else None
+            r.url_latency_ms = main.latency_ms if main else None
+            r.solution_status = sol.status if sol else None
+            r.solution_latency_ms = sol.latency_ms if sol else None
+            r.link_checked_at = now
+            r.is_dead = bool(main is None or main.is_dead)
+            dead += r.is_dead
+            if main and main.error:
+                self.stderr.write(f"#{r.id} {r.url}: {main.error}")
+        Resource.objects.bulk_update(
+            batch,
+            ["url_status", "url_latency_ms", "solution_status", "solution_latency_ms",
+             "link_checked_at", "is_dead"],
+        )
+        return dead
@@ -0,0 +1,132 @@
+import logging
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import (
+    AssistantMessage, AssistantThread, Course, Enrollment, Lesson, LessonProgress, QuizAttempt, QuizQuestion, Topic,
+)
+from core.slowqueries import explain, full_scans
+
+
+class _Rollback(Exception):
+    pass
+
+
+# Tables that grow with users/content; a full scan of any of them fails the check.
+HOT_TABLES = [m._meta.db_table for m in (LessonProgress, QuizQuestion, QuizAttempt, AssistantMessage, User)]
+
+
+def hot_requests(user, topic):
+    """
+    (name, method, url name, data, logged_in) for the requests whose SQL is
+    checked. The SQL is captured from the views themselves, so a view whose
+    query stops using an index fails here.
+    """
+    return [
+        ("api_login (username or email)", "POST", "api_login",
+         {"email": user.email.title(), "password": "not-the-password"}, False),
+        ("api_lessons", "GET", "api_lessons", {"topic_id": topic.id}, True),
+        ("api_progress_weekly", "GET", "api_progress_weekly", {}, True),
+        ("api_quiz_generate", "GET", "api_quiz_generate", {"count": 6}, True),
+        ("api_quiz_history", "GET", "api_quiz_history", {}, True),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway rows (rolled back), run the hot API views through the test client, "
+        "EXPLAIN every SELECT they issue and fail if any scans a whole hot table. Run in CI after migrate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000, help="Rows seeded per hot table.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every captured query and plan.")
+
+    def handle(self, *args, **opts):
+        # Over-budget warnings and slow-query records would drown the report.
+        for name in ("core.perf", "core.slowquery", "django.request"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+        hot = [re.compile(rf"\b{re.escape(t)}\b") for t in HOT_TABLES]
+
+        failures = []
+        try:
+            with transaction.atomic():
+                user, topic = self._seed(opts["rows"])
+                anon, authed = Client(raise_request_exception=False), Client(raise_request_exception=False)
+                authed.force_login(user)
+                for name, method, url_name, data, logged_in in hot_requests(user, topic):
+                    client = authed if logged_in else anon
+                    with CaptureQueriesContext(connection) as ctx:
+                        if method == "POST":
+                            response = client.post(reverse(url_name), data, content_type="application/json")
+                        else:
+                            response = client.get(reverse(url_name), data)
+                    scanning = []
+                    for q in ctx.captured_queries:
+                        plan = explain(connection, q["sql"])
+                        scans = [line for line in full_scans(plan, connection.vendor) if any(p.search(line) for p in hot)]
+                        if scans:
+                            scanning.append((q["sql"], plan))
+                        elif opts["verbose_plans"] and plan:
+                            self.stdout.write(f"          {q['sql'][:200]}")
+                            for line in plan:
+                                self.stdout.write(f"            {line}")
+                    status = "FULL SCAN" if scanning else "ok"
+                    self.stdout.write(
+                        f"{status:9} {name} (HTTP {response.status_code}, {len(ctx.captured_queries)} queries)"
+                    )
+                    for sql, plan in scanning:
+                        self.stdout.write(f"          {sql[:300]}")
+                        for line in plan:
+                            self.stdout.write(f"            {line}")
+                    if scanning:
+                        failures.append(name)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot view{'' if len(failures) == 1 else 's'} scan: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot view queries use an index."))
+
+    def _seed(self, rows):
+        """Enough rows (plus ANALYZE on SQLite) that the planner prefers real indexes."""
+        course = Course.objects.create(title="plan-check course")
+        topic = Topic.objects.create(course=course, title="plan-check topic")
+        lessons = Lesson.objects.bulk_create(
+            [Lesson(topic=topic, order=i, title=f"L{i}") for i in range(rows)]
+        )
+        users = User.objects.bulk_create(
+            [User(username=f"plan-check-{i}", email=f"plan.check.{i}@example.com") for i in range(50)]
+        )
+        if any(u.pk is None for u in users):
+            users = list(User.objects.filter(username__startswith="plan-check-"))
+        user = users[0]
+        Enrollment.objects.create(user=user, course=course)
+        now = timezone.now()
+        LessonProgress.objects.bulk_create([
+            LessonProgress(user=users[i % len(users)], lesson=lessons[i], completed=i % 3 != 0,
+                           completed_at=now - timedelta(hours=i))
+            for i in range(rows)
+        ])
+        QuizQuestion.objects.bulk_create([
+            QuizQuestion(topic=topic, text=f"Q{i}", difficulty=("easy", "med", "hard")[i % 3])
+            for i in range(rows)
+        ])
+        QuizAttempt.objects.bulk_create([QuizAttempt(user=users[i % len(users)]) for i in range(rows)])
+        thread = AssistantThread.objects.create(user=user)
+        AssistantMessage.objects.bulk_create([
+            AssistantMessage(thread=thread, role="user", content=f"m{i}") for i in range(rows)
+        ])
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        return user, topic
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import DEFAULT_BATCH_SIZE, RECORD_TYPES, ContentImportError, import_files
+
+
+class Command(BaseCommand):
+    help = "Stream courses/topics/lessons/questions from JSONL or CSV files into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help=".jsonl or .csv files, imported in the given order.")
+        parser.add_argument(
+            "--type", choices=RECORD_TYPES, dest="record_type",
+            help="Record type for files whose rows have no `type` field (e.g. a questions.csv).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+            help="Records buffered per type before a chunk is written in one transaction.",
+        )
+        parser.add_argument(
+            "--skip-duplicates", action="store_true",
+            help="Skip questions flagged as near-duplicates instead of importing them.",
+        )
+        parser.add_argument("--no-dedupe", action="store_true", help="Skip near-duplicate detection entirely.")
+
+    def handle(self, *args, **opts):
+        try:
+            importer = import_files(
+                opts["paths"],
+                record_type=opts["record_type"],
+                batch_size=opts["batch_size"],
+                dedupe=not opts["no_dedupe"],
+                skip_duplicates=opts["skip_duplicates"],
+            )
+        except (ContentImportError, OSError) as e:
+            raise CommandError(str(e))
+
+        for topic_id, text, match, sim in importer.duplicates:
+            match = f"question #{match}" if isinstance(match, int) else repr(match[:60])
+            self.stderr.write(f"near-duplicate ({sim:.2f}) in topic #{topic_id}: {text[:60]!r} ~ {match}")
+        summary = ", ".join(f"{n} {t}s" for t, n in importer.stats.items())
+        flagged = len(importer.duplicates)
+        action = "skipped" if opts["skip_duplicates"] else "flagged"
+        self.stdout.write(self.style.SUCCESS(f"Imported {summary}; {flagged} near-duplicate questions {action}."))
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadreplay import load_scenario, replay
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a weighted student session mix (browse, mark lessons, quiz, chat) with many "
+        "concurrent async clients against a running server. Log-ins use the bench users from "
+        "`manage.py bench`, so point the server at that database. Scenario file (JSON): "
+        '{"weights": {"browse": 6, "mark_lesson": 3, "quiz": 2, "chat": 1}, '
+        '"think_time_ms": [50, 250], "users": 1000}'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--scenario", help="JSON file overriding the default weights/think time.")
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds.")
+        parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds to stagger client starts over.")
+        parser.add_argument("--seed", type=int, default=68)
+        parser.add_argument("--output", help="Write the full JSON report here.")
+
+    def handle(self, *args, **opts):
+        try:
+            scenario = load_scenario(opts["scenario"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"Replaying {scenario['weights']} with {opts['concurrency']} clients for {opts['duration']:.0f}s against {opts['url']}"
+        )
+        report = asyncio.run(replay(
+            opts["url"], scenario, opts["concurrency"], opts["duration"], opts["ramp_up"], opts["seed"],
+        ))
+        if not report["requests"]:
+            raise CommandError("No requests completed; is the server running?")
+
+        self.stdout.write(
+            f"\n{report['requests']} requests in {report['elapsed_s']}s = {report['throughput_rps']} req/s  "
+            f"errors {report['error_rate']:.2%}  db locked {report['lock_error_rate']:.2%}  "
+            f"p50 {report['p50_ms']}ms  p95 {report['p95_ms']}ms  p99 {report['p99_ms']}ms"
+        )
+        self.stdout.write(f"actions: {report['actions']}\n")
+        self.stdout.write(f"{'endpoint':<22}{'reqs':>7}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  outcomes")
+        for name, e in report["endpoints"].items():
+            self.stdout.write(
+                f"{name:<22}{e['requests']:>7}{e['error_rate'] * 100:>6.1f}%{e['p50_ms']:>9}{e['p95_ms']:>9}"
+                f"{e['p99_ms']:>9}{e['max_ms']:>9}  {e['outcomes']}"
+            )
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {opts['output']}"))
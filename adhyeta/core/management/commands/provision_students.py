@@ -0,0 +1,38 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.provisioning import DEFAULT_BATCH_SIZE, provision_roster
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create students from a roster CSV (student_name, email, phone, student_type[, password]). "
+        "By default passwords are unusable and students activate via forgot-password OTP."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("roster", help="Path to the roster CSV.")
+        parser.add_argument(
+            "--passwords", choices=("unusable", "hash"), default="unusable",
+            help="'hash' hashes the roster's password column in a process pool.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count(), help="Hashing processes (default: CPU count; 1 = in-process).",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **opts):
+        try:
+            with open(opts["roster"], newline="", encoding="utf-8-sig") as fh:
+                result = provision_roster(
+                    fh, password_mode=opts["passwords"], batch_size=opts["batch_size"], workers=opts["workers"],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for lineno, email, reason in result.skipped:
+            self.stderr.write(f"line {lineno}: skipped {email or '<no email>'} ({reason})")
+        self.stdout.write(self.style.SUCCESS(
+            f"Provisioned {result.created} students; skipped {len(result.skipped)}."
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from core.utils import purge_expired_otps
+
+
+class Command(BaseCommand):
+    help = "Delete expired OTP rows (uses the expires_at index; safe to run from cron)."
+
+    def handle(self, *args, **opts):
+        self.stdout.write(self.style.SUCCESS(f"Purged {purge_expired_otps()} expired OTPs."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.dedupe import DEFAULT_THRESHOLD, LSHIndex, minhash
+from core.models import QuizQuestion
+
+
+class Command(BaseCommand):
+    help = "Report near-duplicate QuizQuestions per topic using MinHash/LSH."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Min estimated Jaccard similarity.")
+        parser.add_argument("--topic", type=int, help="Only scan this topic id.")
+
+    def handle(self, *args, **opts):
+        qs = QuizQuestion.objects.order_by("topic_id", "id")
+        if opts["topic"]:
+            qs = qs.filter(topic_id=opts["topic"])
+
+        pairs = 0
+        index, current_topic = None, None
+        for qid, topic_id, text in qs.values_list("id", "topic_id", "text").iterator(chunk_size=2000):
+            if topic_id != current_topic:
+                index, current_topic = LSHIndex(opts["threshold"]), topic_id
+            sig = minhash(text)
+            for other, sim in index.query(sig):
+                pairs += 1
+                self.stdout.write(f"topic #{topic_id}: question #{qid} ~ #{other} ({sim:.2f})  {text[:70]!r}")
+            index.add(qid, sig)
+
+        self.stdout.write(self.style.SUCCESS(f"{pairs} near-duplicate pairs found."))
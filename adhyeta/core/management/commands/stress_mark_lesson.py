@@ -0,0 +1,78 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, OperationalError, connections
+from django.utils import timezone
+
+from core.models import Enrollment, Lesson, LessonProgress
+from core.views import mark_lesson_completed
+
+
+def _legacy_mark(user, lesson_id, course_id):
+    """The previous get_or_create + save() flow of api_mark_lesson."""
+    lesson = Lesson.objects.get(id=lesson_id)
+    lp, _ = LessonProgress.objects.get_or_create(user=user, lesson=lesson)
+    lp.completed = True
+    lp.completed_at = timezone.now()
+    lp.save()
+    Enrollment.objects.get_or_create(user=user, course=lesson.topic.course)
+
+
+class Command(BaseCommand):
+    help = "Threaded stress test of lesson marking: upsert path vs the legacy get_or_create path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--users", type=int, default=2, help="Few users + few lessons = hot rows.")
+        parser.add_argument("--mode", choices=("upsert", "legacy"), default="upsert")
+
+    def handle(self, *args, **opts):
+        lessons = list(Lesson.objects.values_list("id", "topic__course_id")[:4])
+        if not lessons:
+            raise CommandError("No lessons; run /api/seed-demo or import_content first.")
+        users = [
+            User.objects.get_or_create(username=f"stress-mark-{i}@example.com")[0] for i in range(opts["users"])
+        ]
+        mark = mark_lesson_completed if opts["mode"] == "upsert" else _legacy_mark
+
+        deadline = time.monotonic() + opts["seconds"]
+        counts = [{"ok": 0, "integrity": 0, "locked": 0} for _ in range(opts["threads"])]
+
+        def worker(i):
+            n = i
+            try:
+                while time.monotonic() < deadline:
+                    user = users[n % len(users)]
+                    lesson_id, course_id = lessons[n % len(lessons)]
+                    n += 1
+                    try:
+                        mark(user, lesson_id, course_id)
+                        counts[i]["ok"] += 1
+                    except IntegrityError:
+                        counts[i]["integrity"] += 1
+                    except OperationalError:
+                        counts[i]["locked"] += 1
+            finally:
+                connections.close_all()
+
+        # Start from a clean slate so the legacy path has rows to race on creating.
+        LessonProgress.objects.filter(user__in=users).delete()
+        Enrollment.objects.filter(user__in=users).delete()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(opts["threads"])]
+        t0 = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - t0
+
+        total = {k: sum(c[k] for c in counts) for k in counts[0]}
+        User.objects.filter(pk__in=[u.pk for u in users]).delete()
+        self.stdout.write(
+            f"mode={opts['mode']} threads={opts['threads']} marks={total['ok']} ({total['ok'] / elapsed:.1f}/s) "
+            f"integrity_errors={total['integrity']} lock_errors={total['locked']}"
+        )
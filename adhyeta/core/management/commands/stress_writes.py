@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+
+from core.models import AttemptAnswer, QuizAttempt, QuizQuestion
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrency stress test: N threads submit quiz attempts (attempt + answers in one "
+        "transaction) and we report writes/sec and 'database is locked' errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--answers", type=int, default=6, help="AttemptAnswer rows per submission.")
+        parser.add_argument(
+            "--profile", choices=("tuned", "baseline"), default="tuned",
+            help="'baseline' drops the configured SQLite OPTIONS and uses rollback-journal mode for comparison.",
+        )
+        parser.add_argument(
+            "--scratch-db", metavar="PATH",
+            help="Copy the SQLite database to PATH and stress the copy. Required for --profile baseline, "
+                 "whose journal_mode change would otherwise persist in the configured database.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["scratch_db"]:
+            self._use_scratch_copy(opts["scratch_db"])
+        elif opts["profile"] == "baseline" and connection.vendor == "sqlite":
+            raise CommandError(
+                "--profile baseline sets journal_mode=DELETE, which is stored in the database file; "
+                "pass --scratch-db PATH to run it on a copy."
+            )
+
+        questions = list(QuizQuestion.objects.values_list("id", flat=True)[: opts["answers"]])
+        if not questions:
+            raise CommandError("No quiz questions; run /api/seed-demo and /api/quiz/seed (or import_content) first.")
+
+        if opts["profile"] == "baseline" and connection.vendor == "sqlite":
+            connection.settings_dict["OPTIONS"] = {}
+            connection.close()
+            with connection.cursor() as cur:
+                cur.execute("PRAGMA journal_mode=DELETE")
+        elif opts["scratch_db"]:
+            # settings leave WAL off for the dev database; the copy is ours to switch.
+            with connection.cursor() as cur:
+                cur.execute("PRAGMA journal_mode=WAL")
+
+        user, _ = User.objects.get_or_create(username="stress-writer@example.com")
+        deadline = time.monotonic() + opts["seconds"]
+        ok = [0] * opts["threads"]
+        locked = [0] * opts["threads"]
+        other = [0] * opts["threads"]
+
+        def worker(i):
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        with transaction.atomic():
+                            # Read before writing, like api_quiz_submit grading answers
+                            QuizQuestion.objects.filter(id__in=questions).count()
+                            a = QuizAttempt.objects.create(user=user, source="stress", total=len(questions))
+                            AttemptAnswer.objects.bulk_create(
+                                [AttemptAnswer(attempt=a, question_id=q) for q in questions]
+                            )
+                        ok[i] += 1
+                    except OperationalError as e:
+                        if "locked" in str(e):
+                            locked[i] += 1
+                        else:
+                            other[i] += 1
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(opts["threads"])]
+        t0 = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - t0
+
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cur:
+                cur.execute("PRAGMA journal_mode")
+                mode = cur.fetchone()[0]
+        else:
+            mode = connection.vendor
+        user.delete()
+
+        self.stdout.write(
+            f"profile={opts['profile']} journal={mode} threads={opts['threads']} "
+            f"submissions={sum(ok)} ({sum(ok) / elapsed:.1f}/s) "
+            f"locked_errors={sum(locked)} other_errors={sum(other)}"
+        )
+
+    def _use_scratch_copy(self, path):
+        """Point every connection (including the worker threads') at a fresh copy of the database."""
+        if connection.vendor != "sqlite":
+            raise CommandError("--scratch-db only applies to SQLite.")
+        source = str(connection.settings_dict["NAME"])
+        if os.path.realpath(path) == os.path.realpath(source):
+            raise CommandError("--scratch-db must not be the configured database.")
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+        connection.close()
+        connection.settings_dict["NAME"] = path
+        self.stdout.write(f"Stressing a copy of {source} at {path}")
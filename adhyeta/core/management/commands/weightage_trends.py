@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.analytics import DEFAULT_WINDOW, weightage_trends
+from core.models import Exam
+
+
+class Command(BaseCommand):
+    help = "Compute (and cache) multi-year SubjectWeightage trends per exam."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", help="Exam slug (default: all exams).")
+        parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Moving average window in years.")
+
+    def handle(self, *args, **opts):
+        exams = Exam.objects.order_by("name")
+        if opts["exam"]:
+            exams = exams.filter(slug=opts["exam"])
+            if not exams.exists():
+                raise CommandError(f"Unknown exam slug: {opts['exam']}")
+
+        for exam in exams:
+            report = weightage_trends(exam.id, window=opts["window"], refresh=True)
+            years = report["years"]
+            span = f"{years[0]}–{years[-1]}" if years else "no yearly data"
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{exam.name} ({span})"))
+            for s in report["subjects"]:
+                self.stdout.write(
+                    f"  {s['name']:<30} latest={s['latest']}%  avg{opts['window']}={s['moving_avg']}%  "
+                    f"slope={s['slope']:+}/yr  predicted {report['next_year']}={s['predicted']}%"
+                )
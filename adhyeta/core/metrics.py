@@ -0,0 +1,309 @@
+# core/metrics.py
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+try:  # POSIX only; without it dead workers' files are simply kept
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+# ======================
+# Metric registry
+# ======================
+
+class Registry:
+    """
+    Process-local counter store with Prometheus text exposition.
+
+    Every sample is a monotonic counter (histograms are stored as their
+    _bucket/_sum/_count counters), so values from several worker processes
+    can simply be summed. With `directory` set a daemon thread in each
+    process mirrors its values to <directory>/<pid>-<start>.json within
+    `flush_interval` seconds of a change (and at exit), so idle workers are
+    current too; `render` sums all files in the directory.
+
+    The file name is chosen on the first write in each process, so workers
+    forked after import (gunicorn --preload) never share one. Files of
+    exited workers are folded into merged.json on scrape, so counters never
+    go backwards and a scrape reads one file per live worker. Clear the
+    directory when the service is redeployed.
+    """
+
+    MERGED = "merged.json"
+
+    def __init__(self, directory=None, flush_interval=2.0):
+        self.metrics = {}
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._values = defaultdict(float)  # (sample name, labels tuple) -> value
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._thread = None
+        self._pid = os.getpid()
+        self._file = None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atexit.register(self.flush)
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    def _check_fork(self):
+        if os.getpid() != self._pid:
+            # Forked after import: the parent's counts belong to the parent.
+            self._pid = os.getpid()
+            self._file = None
+            self._lock = threading.Lock()
+            self._values = defaultdict(float)
+            self._dirty = False
+            self._thread = None  # threads do not survive fork
+
+    def inc(self, sample, labels, amount=1.0):
+        self.inc_many(((sample, labels, amount),))
+
+    def inc_many(self, items):
+        self._check_fork()
+        with self._lock:
+            for sample, labels, amount in items:
+                self._values[(sample, labels)] += amount
+            self._dirty = True
+        if self.directory:
+            self._ensure_thread()
+
+    def snapshot(self):
+        self._check_fork()
+        with self._lock:
+            return dict(self._values)
+
+    # ---- multiprocess files ----
+    def flush(self):
+        if not self.directory:
+            return
+        self._check_fork()
+        with self._lock:
+            values, self._dirty = dict(self._values), False
+        if self._file is None:
+            if not values:
+                return  # e.g. a --preload master that never served a request
+            self._file = self.directory / f"{self._pid}-{time.time_ns()}.json"
+        _write_json(self._file, _rows(values))
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        me = threading.current_thread()
+        while self._thread is me:  # a fork replaces (and abandons) the thread
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def collect(self):
+        """Summed values of this process and every other worker's file."""
+        totals = defaultdict(float, self.snapshot())
+        if self.directory:
+            self._merge_dead_files()
+            merged = _read_json(self.directory / self.MERGED) or {}
+            absorbed = set(merged.get("absorbed", ()))
+            _add_rows(totals, merged.get("rows", ()))
+            for path in self.directory.glob("*-*.json"):
+                if path == self._file or path.name in absorbed:
+                    continue
+                _add_rows(totals, _read_json(path) or ())
+        return totals
+
+    def _merge_dead_files(self):
+        """Fold the files of exited workers into merged.json, then delete them."""
+        if fcntl is None:
+            return  # no flock (and no safe liveness probe) on this platform
+        with open(self.directory / ".merge.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            dead = [
+                p for p in self.directory.glob("*-*.json")
+                if p != self._file and not _pid_alive(p.name.split("-", 1)[0])
+            ]
+            if not dead:
+                return
+            merged_path = self.directory / self.MERGED
+            merged = _read_json(merged_path) or {}
+            # Names already folded in but not yet unlinked (a previous merge
+            # died in between) must not be counted twice.
+            absorbed = {n for n in merged.get("absorbed", ()) if (self.directory / n).exists()}
+            totals = defaultdict(float)
+            _add_rows(totals, merged.get("rows", ()))
+            for path in dead:
+                if path.name not in absorbed:
+                    _add_rows(totals, _read_json(path) or ())
+                    absorbed.add(path.name)
+            _write_json(merged_path, {"absorbed": sorted(absorbed), "rows": _rows(totals)})
+            for path in dead:
+                path.unlink(missing_ok=True)
+
+    # ---- exposition ----
+    def render(self):
+        totals = self.collect()
+        by_metric = defaultdict(list)
+        for (sample, labels), value in totals.items():
+            by_metric[_base_name(sample, self.metrics)].append((sample, labels, value))
+
+        lines = []
+        for name in sorted(self.metrics):
+            m = self.metrics[name]
+            lines.append(f"# HELP {name} {m.documentation}")
+            lines.append(f"# TYPE {name} {m.kind}")
+            if not m.labelnames and m.kind == "counter" and name not in by_metric:
+                lines.append(f"{name} 0")
+            for sample, labels, value in sorted(by_metric.get(name, []), key=_sample_order):
+                lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _rows(values):
+    return [[s, list(map(list, labels)), v] for (s, labels), v in values.items()]
+
+
+def _add_rows(totals, rows):
+    for sample, labels, value in rows:
+        totals[(sample, tuple(map(tuple, labels)))] += value
+
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None  # mid-replace or removed
+
+
+def _write_json(path, data):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except ValueError:
+        return True  # not a worker file name; leave it alone
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by someone else
+    return True
+
+
+def _base_name(sample, metrics):
+    if sample in metrics:
+        return sample
+    for suffix in ("_bucket", "_sum", "_count"):
+        if sample.endswith(suffix) and sample[:-len(suffix)] in metrics:
+            return sample[:-len(suffix)]
+    return sample
+
+
+def _sample_order(item):
+    sample, labels, _ = item
+    plain = tuple((k, v) for k, v in labels if k != "le")
+    le = dict(labels).get("le")
+    return (plain, sample, math.inf if le == "+Inf" else float(le or 0))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels) + "}"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+# ======================
+# Metric types
+# ======================
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or REGISTRY
+        self.registry.register(self)
+
+    def _labels(self, values):
+        return tuple(zip(self.labelnames, (str(v) for v in values)))
+
+    def inc(self, *labelvalues, amount=1):
+        self.registry.inc(self.name, self._labels(labelvalues), amount)
+
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=(), registry=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, *labelvalues):
+        labels = self._labels(labelvalues)
+        # Every bucket gets a sample (0 when not hit) so the series exist
+        # before the first slow request.
+        items = [
+            (f"{self.name}_bucket", labels + (("le", "+Inf" if b == math.inf else repr(float(b))),), int(value <= b))
+            for b in self.buckets
+        ]
+        items.append((f"{self.name}_sum", labels, value))
+        items.append((f"{self.name}_count", labels, 1))
+        self.registry.inc_many(items)
+
+
+REGISTRY = Registry(
+    directory=getattr(settings, "METRICS_MULTIPROC_DIR", None),
+    flush_interval=getattr(settings, "METRICS_FLUSH_SECONDS", 2.0),
+)
+
+
+# ======================
+# Application metrics
+# ======================
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+HTTP_REQUESTS = Counter(
+    "adhyeta_http_requests_total", "HTTP responses by URL name, method and status.",
+    ("view", "method", "status"),
+)
+HTTP_LATENCY = Histogram(
+    "adhyeta_http_request_duration_seconds", "Request latency by URL name.",
+    ("view",), LATENCY_BUCKETS,
+)
+HTTP_DB_QUERIES = Histogram(
+    "adhyeta_http_request_db_queries", "SQL queries per request by URL name.",
+    ("view",), QUERY_BUCKETS,
+)
+
+QUIZZES_SUBMITTED = Counter("adhyeta_quizzes_submitted_total", "Quiz attempts submitted.")
+LESSONS_MARKED = Counter("adhyeta_lessons_marked_total", "Lessons marked completed.")
+ASSISTANT_MESSAGES = Counter("adhyeta_assistant_messages_total", "Messages sent to the AI assistant.")
@@ -0,0 +1,139 @@
+# core/middleware.py
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+from .slowqueries import MAX_PER_REQUEST, log_slow_queries
+
+
+perf_logger = logging.getLogger("core.perf")
+
+
+# ======================
+# Per-request query timing
+# ======================
+
+class QueryStats:
+    """
+    connection.execute_wrapper hook: counts and times every SQL query and
+    keeps the ones slower than `slow_ms` for the slow-query log.
+    """
+
+    def __init__(self, slow_ms=None):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.slow_ms = slow_ms
+        self.slow = []  # (alias, sql, params, many, ms)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            ms = elapsed * 1000
+            if self.slow_ms is not None and ms >= self.slow_ms and len(self.slow) < MAX_PER_REQUEST:
+                self.slow.append((context["connection"].alias, sql, params, many, ms))
+
+
+@contextmanager
+def track_queries(request):
+    """
+    Attach a QueryStats to `request` for the duration of the block. An
+    outer middleware's stats are reused, so nested middlewares do not wrap
+    the connections twice. The outermost block writes the slow-query log
+    once the wrappers are removed.
+    """
+    stats = getattr(request, "query_stats", None)
+    if stats is not None:
+        yield stats
+        return
+    stats = request.query_stats = QueryStats(slow_ms=settings.SLOW_QUERY_MS)
+    with ExitStack() as stack:
+        for conn in connections.all(initialized_only=False):
+            stack.enter_context(conn.execute_wrapper(stats))
+        yield stats
+    if stats.slow:
+        log_slow_queries(
+            request, stats.slow,
+            explain_plans=settings.SLOW_QUERY_EXPLAIN, log_params=settings.SLOW_QUERY_LOG_PARAMS,
+        )
+
+
+class QueryTimingMiddleware:
+    """
+    Counts/times SQL per request on a sampled fraction of requests and adds
+
+        Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>, total;dur=<ms>
+
+    Requests over REQUEST_QUERY_BUDGET queries or REQUEST_LATENCY_BUDGET_MS
+    are logged to "core.perf". REQUEST_TIMING_SAMPLE_RATE (0..1) keeps the
+    overhead negligible in production; unsampled requests are untouched.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.query_budget = settings.REQUEST_QUERY_BUDGET
+        self.latency_budget_ms = settings.REQUEST_LATENCY_BUDGET_MS
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return self.get_response(request)
+
+        with track_queries(request) as stats:
+            count0, duration0 = stats.count, stats.duration
+            start = time.perf_counter()
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        count = stats.count - count0
+        db_ms = (stats.duration - duration0) * 1000
+
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{count} queries", '
+            f"app;dur={total_ms - db_ms:.1f}, total;dur={total_ms:.1f}"
+        )
+
+        if count > self.query_budget or total_ms > self.latency_budget_ms:
+            match = getattr(request, "resolver_match", None)
+            perf_logger.warning(
+                "over budget: %s %s view=%s queries=%d db_ms=%.1f total_ms=%.1f status=%s",
+                request.method, request.path, match.view_name if match else "-",
+                count, db_ms, total_ms, response.status_code,
+            )
+        return response
+
+
+# ======================
+# Prometheus metrics
+# ======================
+
+class MetricsMiddleware:
+    """
+    Records request count, latency and SQL query count per URL name into
+    core.metrics. Requests that match no URL are folded into "unmatched"
+    so scanners cannot blow up label cardinality.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with track_queries(request) as stats:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        metrics.HTTP_REQUESTS.inc(view, request.method, response.status_code)
+        metrics.HTTP_LATENCY.observe(elapsed, view)
+        metrics.HTTP_DB_QUERIES.observe(stats.count, view)
+        return response
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS core_resource_fts USING fts5(
+        title, source, content='core_resource', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_resource_fts_ai AFTER INSERT ON core_resource BEGIN
+        INSERT INTO core_resource_fts(rowid, title, source) VALUES (new.id, new.title, new.source);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_resource_fts_ad AFTER DELETE ON core_resource BEGIN
+        INSERT INTO core_resource_fts(core_resource_fts, rowid, title, source)
+        VALUES ('delete', old.id, old.title, old.source);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_resource_fts_au AFTER UPDATE OF title, source ON core_resource BEGIN
+        INSERT INTO core_resource_fts(core_resource_fts, rowid, title, source)
+        VALUES ('delete', old.id, old.title, old.source);
+        INSERT INTO core_resource_fts(rowid, title, source) VALUES (new.id, new.title, new.source);
+    END
+    """,
+    "INSERT INTO core_resource_fts(core_resource_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_resource_fts_au",
+    "DROP TRIGGER IF EXISTS core_resource_fts_ad",
+    "DROP TRIGGER IF EXISTS core_resource_fts_ai",
+    "DROP TABLE IF EXISTS core_resource_fts",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS core_resource_search_gin ON core_resource "
+    "USING GIN (to_tsvector('simple', title || ' ' || source))",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS core_resource_search_gin",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_alter_assistantmessage_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_resource_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='is_dead',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='solution_latency_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='solution_status',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='url_latency_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='url_status',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['link_checked_at'], name='core_resour_link_ch_644d34_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_resource_link_health'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Case-insensitive email lookups for core.backends.EmailOrUsernameBackend.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS core_auth_user_email_lower ON auth_user (LOWER(email))",
+            "DROP INDEX IF EXISTS core_auth_user_email_lower",
+        ),
+    ]
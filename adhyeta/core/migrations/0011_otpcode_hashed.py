@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:41
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def discard_plaintext_otps(apps, schema_editor):
+    # Existing rows hold plaintext codes and have no expiry; they are short-lived anyway.
+    apps.get_model('core', 'OTPCode').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_auth_user_email_lower_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(discard_plaintext_otps, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='otpcode',
+            name='core_otpcod_user_id_0db1b9_idx',
+        ),
+        migrations.RemoveField(
+            model_name='otpcode',
+            name='code',
+        ),
+        migrations.AddField(
+            model_name='otpcode',
+            name='code_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='otpcode',
+            name='expires_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['user', 'code_hash'], name='core_otpcod_user_id_d873e3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['expires_at'], name='core_otpcod_expires_4df96f_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_otpcode_hashed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # auth_user email lookups are already covered by the LOWER(email)
+    # expression index from 0010.
+    operations = [
+        migrations.AddIndex(
+            model_name='assistantmessage',
+            index=models.Index(fields=['thread', 'created_at'], name='core_am_thread_created'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonprogress',
+            index=models.Index(fields=['user', 'completed', 'completed_at'], name='core_lp_user_done_at'),
+        ),
+        migrations.AddIndex(
+            model_name='quizquestion',
+            index=models.Index(fields=['topic', 'difficulty'], name='core_qq_topic_difficulty'),
+        ),
+    ]
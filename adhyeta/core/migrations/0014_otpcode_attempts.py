@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_requestprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otpcode',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
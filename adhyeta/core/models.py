@@ -27,24 +27,30 @@ class StudentProfile(models.Model):
 
 class OTPCode(models.Model):
     """
-    Stores one-time passwords (OTP) for password reset / verification.
+    Durable fallback for one-time passwords (OTP) used in password reset.
+    The live copy is kept in the cache (see core.utils); only an HMAC of
+    the code is ever stored.
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='otp_codes')
-    code = models.CharField(max_length=6)
+    code_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
+    # Wrong guesses so far; bumped with an atomic UPDATE (see core.utils.check_otp).
+    attempts = models.PositiveSmallIntegerField(default=0)
 
     class Meta:
         verbose_name = "OTP Code"
         verbose_name_plural = "OTP Codes"
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'code']),
+            models.Index(fields=['user', 'code_hash']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['expires_at']),
         ]
 
     def __str__(self):
-        return f"OTP {self.code} for {self.user.username}"
+        return f"OTP for {self.user.username} (expires {self.expires_at:%Y-%m-%d %H:%M})"
 
 
 # ===============
@@ -119,6 +125,9 @@ class LessonProgress(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'lesson'], name='unique_lesson_progress'),
         ]
+        indexes = [
+            models.Index(fields=['user', 'completed', 'completed_at'], name='core_lp_user_done_at'),
+        ]
         ordering = ['-completed', '-completed_at', 'lesson_id']
 
     def __str__(self):
@@ -142,6 +151,9 @@ class QuizQuestion(models.Model):
 
     class Meta:
         ordering = ['topic', 'id']
+        indexes = [
+            models.Index(fields=['topic', 'difficulty'], name='core_qq_topic_difficulty'),
+        ]
 
     def __str__(self):
         return f"[{self.topic.title}] {self.text[:50]}"
@@ -218,6 +230,9 @@ class AssistantMessage(models.Model):
 
     class Meta:
         ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['thread', 'created_at'], name='core_am_thread_created'),
+        ]
 
 
 # ==================
@@ -319,14 +334,49 @@ class Resource(models.Model):
     year = models.PositiveIntegerField(null=True, blank=True)  # for papers
     solution_url = models.URLField(blank=True)  # for papers with solutions
 
+    # Link health (filled by `manage.py check_links`)
+    url_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    url_latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    solution_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    solution_latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    link_checked_at = models.DateTimeField(null=True, blank=True)
+    is_dead = models.BooleanField(default=False)
+
     class Meta:
         ordering = ['kind', '-year', 'title']
         indexes = [
             models.Index(fields=['subject', 'kind']),
             models.Index(fields=['year']),
+            models.Index(fields=['link_checked_at']),
         ]
 
     def __str__(self):
         return f"[{self.get_kind_display()}] {self.title}"
 
 
+# ===========
+# Diagnostics
+# ===========
+
+class RequestProfile(models.Model):
+    """A single request captured under a profiler by a staff user (core.profiling)."""
+    ENGINE_CHOICES = (
+        ('cprofile', 'cProfile'),
+        ('pyinstrument', 'pyinstrument (sampling)'),
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    view_name = models.CharField(max_length=120)
+    method = models.CharField(max_length=8)
+    path = models.CharField(max_length=500)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.PositiveIntegerField()
+    query_count = models.PositiveIntegerField(default=0)
+    engine = models.CharField(max_length=16, choices=ENGINE_CHOICES, default='cprofile')
+    file_path = models.CharField(max_length=500)  # .prof (pstats) or .speedscope.json
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.view_name} @ {self.created_at:%Y-%m-%d %H:%M:%S} ({self.duration_ms} ms)"
@@ -0,0 +1,128 @@
+# core/profiling.py
+import cProfile
+import io
+import pstats
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RequestProfile
+
+try:  # optional sampling profiler
+    import pyinstrument
+except ImportError:  # pragma: no cover
+    pyinstrument = None
+
+
+# ======================
+# Opt-in request profiling
+# ======================
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "_profile"
+
+# cProfile cannot run two profilers in one process at once; a second
+# flagged request just runs normally.
+_busy = threading.Lock()
+
+
+def wants_profile(request):
+    flag = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    if not flag or flag.lower() in ("0", "false", "no"):
+        return None
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return None
+    if flag.lower() == "sample" and pyinstrument is not None:
+        return "pyinstrument"
+    return "cprofile"
+
+
+def _target(view_name, suffix):
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in view_name)[:80]
+    return directory / f"{stamp}-{safe}-{uuid.uuid4().hex[:8]}{suffix}"
+
+
+def run_profiled(request, get_response, engine):
+    """Run get_response under `engine`, save the profile and record a RequestProfile."""
+    start = time.perf_counter()
+    if engine == "pyinstrument":
+        profiler = pyinstrument.Profiler(interval=0.001)
+        profiler.start()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.stop()
+    else:
+        profiler = cProfile.Profile()
+        response = profiler.runcall(get_response, request)
+    duration_ms = int((time.perf_counter() - start) * 1000)
+
+    match = getattr(request, "resolver_match", None)
+    view_name = match.view_name if match else "unmatched"
+    if engine == "pyinstrument":
+        from pyinstrument.renderers import SpeedscopeRenderer
+        path = _target(view_name, ".speedscope.json")
+        path.write_text(profiler.output(SpeedscopeRenderer()), encoding="utf-8")
+    else:
+        path = _target(view_name, ".prof")
+        profiler.dump_stats(path)
+
+    stats = getattr(request, "query_stats", None)
+    record = RequestProfile.objects.create(
+        user=request.user if request.user.is_authenticated else None,
+        view_name=view_name,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        query_count=stats.count if stats else 0,
+        engine=engine,
+        file_path=str(path),
+    )
+    response["X-Profile-Id"] = str(record.pk)
+    return response
+
+
+def summarize(profile, limit=30):
+    """Top functions by cumulative time, as text (cProfile captures only)."""
+    if profile.engine != "cprofile":
+        return "Open the .speedscope.json file in https://www.speedscope.app/"
+    try:
+        out = io.StringIO()
+        pstats.Stats(profile.file_path, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+    except OSError as e:
+        return f"Profile file unavailable: {e}"
+
+
+def delete_profile_file(sender, instance, **kwargs):
+    """post_delete hook: remove the file along with its RequestProfile row."""
+    Path(instance.file_path).unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when a staff user sends `X-Profile: 1` (or
+    ?_profile=1). `X-Profile: sample` uses pyinstrument when installed.
+    Must come after AuthenticationMiddleware. The response carries
+    X-Profile-Id, the RequestProfile listed in the admin.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        engine = wants_profile(request)
+        if engine is None or not _busy.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return run_profiled(request, self.get_response, engine)
+        finally:
+            _busy.release()
@@ -0,0 +1,157 @@
+# core/provisioning.py
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from .models import StudentProfile
+
+
+# ======================
+# Bulk student provisioning
+# ======================
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def read_roster(fh):
+    """
+    Stream roster rows from a CSV file object with columns
+    student_name (or name), email, phone, student_type and optional password.
+    """
+    for lineno, row in enumerate(csv.DictReader(fh), start=2):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        yield lineno, {
+            "name": row.get("student_name") or row.get("name") or "",
+            "email": row.get("email", "").lower(),
+            "phone": row.get("phone", ""),
+            "student_type": row.get("student_type", ""),
+            "password": row.get("password", ""),
+        }
+
+
+def _init_worker():
+    django.setup()  # needed under the "spawn" start method
+
+
+def _hash_password(raw):
+    return make_password(raw)
+
+
+class StudentProvisioner:
+    """
+    Creates User + StudentProfile rows in batches with bulk_create.
+
+    Password modes:
+      "unusable" — no hash is computed; students activate their account
+                   through the forgot-password OTP flow (the invite).
+      "hash"     — the roster's `password` column is hashed; with
+                   `workers` > 1 across a process pool so PBKDF2 uses
+                   every core. Only the management command should ask for
+                   a pool: forking inside a web worker is not safe.
+    Emails that already exist (or repeat in the roster) are skipped.
+    """
+
+    def __init__(self, password_mode="unusable", batch_size=DEFAULT_BATCH_SIZE, workers=None):
+        if password_mode not in ("unusable", "hash"):
+            raise ValueError(f"unknown password mode {password_mode!r}")
+        self.password_mode = password_mode
+        self.batch_size = batch_size
+        self.workers = workers
+        self.created = 0
+        self.skipped = []  # (line, email, reason)
+        self._seen = set()
+        self._pool = None
+
+    def __enter__(self):
+        if self.password_mode == "hash" and self.workers and self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool:
+            self._pool.shutdown()
+
+    def run(self, rows):
+        batch = []
+        for lineno, row in rows:
+            if not row["email"] or not row["name"]:
+                self.skipped.append((lineno, row["email"], "missing name/email"))
+                continue
+            if self.password_mode == "hash" and not row["password"]:
+                self.skipped.append((lineno, row["email"], "missing password"))
+                continue
+            if row["email"] in self._seen:
+                self.skipped.append((lineno, row["email"], "duplicate in roster"))
+                continue
+            self._seen.add(row["email"])
+            batch.append((lineno, row))
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+        return self.created
+
+    def _write(self, batch):
+        existing = set(
+            User.objects.filter(username__in=[r["email"] for _, r in batch]).values_list("username", flat=True)
+        )
+        for lineno, r in batch:
+            if r["email"] in existing:
+                self.skipped.append((lineno, r["email"], "already registered"))
+        batch = [(n, r) for n, r in batch if r["email"] not in existing]
+        if not batch:
+            return
+
+        if self.password_mode == "hash" and self._pool:
+            hashes = list(self._pool.map(_hash_password, [r["password"] for _, r in batch], chunksize=16))
+        elif self.password_mode == "hash":
+            hashes = [_hash_password(r["password"]) for _, r in batch]
+        else:
+            hashes = [make_password(None)] * len(batch)  # unusable
+
+        users = []
+        for (_, r), pw in zip(batch, hashes):
+            first, _, last = r["name"].partition(" ")
+            users.append(User(
+                username=r["email"], email=r["email"], password=pw,
+                first_name=first[:150], last_name=last.strip()[:150],
+            ))
+
+        try:
+            with transaction.atomic():
+                self._insert(users, batch)
+        except IntegrityError:
+            # A concurrent signup took one of these emails after the check
+            # above; retry row by row so only that row is skipped.
+            for u, (lineno, r) in zip(users, batch):
+                u.pk = None
+                u._state.adding = True
+                try:
+                    with transaction.atomic():
+                        self._insert([u], [(lineno, r)])
+                except IntegrityError:
+                    self.skipped.append((lineno, r["email"], "already registered"))
+
+    def _insert(self, users, batch):
+        User.objects.bulk_create(users)
+        if any(u.pk is None for u in users):
+            ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list("username", "id"))
+            for u in users:
+                u.pk = ids[u.username]
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user_id=u.pk, phone=r["phone"][:32], student_type=r["student_type"][:64])
+            for u, (_, r) in zip(users, batch)
+        ])
+        self.created += len(users)
+
+
+def provision_roster(fh, **opts):
+    """Provision every student in a roster CSV file object. Returns the provisioner."""
+    with StudentProvisioner(**opts) as p:
+        p.run(read_roster(fh))
+    return p
@@ -0,0 +1,77 @@
+# core/routers.py
+import contextvars
+import random
+import time
+
+from django.conf import settings
+
+
+# ======================
+# Primary / replica routing
+# ======================
+
+PIN_COOKIE = "db_pin"
+
+_pinned = contextvars.ContextVar("db_pinned", default=False)
+_wrote = contextvars.ContextVar("db_wrote", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads go to a random replica alias ("replica_1", ...), writes to
+    "default". A request is pinned to the primary when it is itself a
+    write (non-GET) or when the client wrote within the last
+    DB_PIN_SECONDS (see ReplicaPinMiddleware), so users read their own
+    writes despite replication lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or _pinned.get() or _wrote.get():
+            return "default"
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas mirror the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaPinMiddleware:
+    """
+    Sets the pin for the router and, after a request that wrote, a short
+    cookie so the same client keeps reading from the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        pin = request.method not in ("GET", "HEAD", "OPTIONS") or pinned_until > time.time()
+
+        pin_token = _pinned.set(pin)
+        wrote_token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get() and replica_aliases():
+                seconds = settings.DB_PIN_SECONDS
+                response.set_cookie(
+                    PIN_COOKIE, str(int(time.time() + seconds)), max_age=seconds, httponly=True, samesite="Lax"
+                )
+            return response
+        finally:
+            _pinned.reset(pin_token)
+            _wrote.reset(wrote_token)
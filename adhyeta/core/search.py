@@ -0,0 +1,175 @@
+# core/search.py
+import re
+
+from django.db import connection, connections
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Resource
+
+
+# ======================
+# Resource catalog search
+# ======================
+
+SEARCH_PAGE_SIZE = 50
+SEARCH_MAX_PAGE_SIZE = 200
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Mirrors migration 0008. SQLite drops triggers whenever a migration rebuilds
+# core_resource (e.g. AddField), so they are re-installed after every migrate.
+_SQLITE_TRIGGERS = {
+    "core_resource_fts_ai": """
+        CREATE TRIGGER core_resource_fts_ai AFTER INSERT ON core_resource BEGIN
+            INSERT INTO core_resource_fts(rowid, title, source) VALUES (new.id, new.title, new.source);
+        END
+    """,
+    "core_resource_fts_ad": """
+        CREATE TRIGGER core_resource_fts_ad AFTER DELETE ON core_resource BEGIN
+            INSERT INTO core_resource_fts(core_resource_fts, rowid, title, source)
+            VALUES ('delete', old.id, old.title, old.source);
+        END
+    """,
+    "core_resource_fts_au": """
+        CREATE TRIGGER core_resource_fts_au AFTER UPDATE OF title, source ON core_resource BEGIN
+            INSERT INTO core_resource_fts(core_resource_fts, rowid, title, source)
+            VALUES ('delete', old.id, old.title, old.source);
+            INSERT INTO core_resource_fts(rowid, title, source) VALUES (new.id, new.title, new.source);
+        END
+    """,
+}
+
+
+def ensure_search_triggers(using="default", **kwargs):
+    """
+    post_migrate hook: re-create missing FTS sync triggers and rebuild the
+    index so rows written while they were missing become searchable.
+    """
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cur:
+        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='core_resource_fts'")
+        if not cur.fetchone():
+            return  # migration 0008 not applied yet
+        cur.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'core_resource_fts_%'")
+        present = {row[0] for row in cur.fetchall()}
+        missing = [name for name in _SQLITE_TRIGGERS if name not in present]
+        if not missing:
+            return
+        for name in missing:
+            cur.execute(_SQLITE_TRIGGERS[name])
+        cur.execute("INSERT INTO core_resource_fts(core_resource_fts) VALUES ('rebuild')")
+
+
+def _tokens(q: str) -> list[str]:
+    return _TOKEN_RE.findall((q or "").lower())[:8]
+
+
+def _text_filter(q: str):
+    """
+    Build a filter for `q` over Resource.title/source backed by the text index
+    created in migration 0008 (FTS5 on SQLite, GIN tsvector on PostgreSQL).
+    Returns None when there is nothing to match on.
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        return None
+
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        # Prefix match every token: "arr"* "stack"* (implicit AND)
+        match = " ".join(f'"{t}"*' for t in tokens)
+        return Q(id__in=RawSQL(
+            "SELECT rowid FROM core_resource_fts WHERE core_resource_fts MATCH %s",
+            [match],
+        ))
+    if vendor == "postgresql":
+        match = " & ".join(f"{t}:*" for t in tokens)
+        return Q(id__in=RawSQL(
+            "SELECT id FROM core_resource "
+            "WHERE to_tsvector('simple', title || ' ' || source) @@ to_tsquery('simple', %s)",
+            [match],
+        ))
+
+    # Other backends have no text index; fall back to a LIKE scan.
+    cond = Q()
+    for t in tokens:
+        cond &= Q(title__icontains=t) | Q(source__icontains=t)
+    return cond
+
+
+def _facets(qs) -> dict:
+    """
+    Facet counts per kind / year / subject from a single GROUP BY query.
+    """
+    rows = (
+        qs.order_by()
+        .values("kind", "year", "subject_id", "subject__name")
+        .annotate(n=Count("id"))
+    )
+    kinds, years, subjects = {}, {}, {}
+    for r in rows:
+        kinds[r["kind"]] = kinds.get(r["kind"], 0) + r["n"]
+        if r["year"] is not None:
+            years[r["year"]] = years.get(r["year"], 0) + r["n"]
+        s = subjects.setdefault(r["subject_id"], {"id": r["subject_id"], "name": r["subject__name"], "count": 0})
+        s["count"] += r["n"]
+
+    return {
+        "kind": [{"value": k, "count": n} for k, n in sorted(kinds.items())],
+        "year": [{"value": y, "count": n} for y, n in sorted(years.items(), reverse=True)],
+        "subject": sorted(subjects.values(), key=lambda s: (-s["count"], s["name"])),
+    }
+
+
+def search_resources(q="", exam_slug=None, subject_id=None, kinds=None, year=None,
+                     cursor=None, limit=SEARCH_PAGE_SIZE, include_dead=False) -> dict:
+    """
+    Search the Resource catalog.
+
+    Results are keyset-paginated on descending id: pass the returned
+    `next_cursor` back as `cursor` to fetch the following page. Facets
+    describe the whole filtered result set, not just the current page.
+    Resources whose link failed the last health check are hidden unless
+    `include_dead` is set; dead solution links are blanked.
+    """
+    qs = Resource.objects.all()
+    if not include_dead:
+        qs = qs.filter(is_dead=False)
+    text = _text_filter(q)
+    if text is not None:
+        qs = qs.filter(text)
+    if exam_slug:
+        qs = qs.filter(subject__exam__slug=exam_slug)
+    if subject_id:
+        qs = qs.filter(subject_id=subject_id)
+    if kinds:
+        qs = qs.filter(kind__in=kinds)
+    if year:
+        qs = qs.filter(year=year)
+
+    facets = _facets(qs)
+
+    limit = max(1, min(int(limit), SEARCH_MAX_PAGE_SIZE))
+    page = qs.order_by("-id")
+    if cursor:
+        page = page.filter(id__lt=cursor)
+    rows = list(
+        page.values(
+            "id", "kind", "title", "url", "source", "year", "solution_url", "subject_id", "solution_status"
+        )[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    for r in rows:
+        sol_status = r.pop("solution_status")
+        if sol_status and sol_status >= 400 and not include_dead:
+            r["solution_url"] = ""
+
+    return {
+        "resources": rows,
+        "facets": facets,
+        "next_cursor": rows[-1]["id"] if has_more else None,
+    }
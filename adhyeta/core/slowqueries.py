@@ -0,0 +1,124 @@
+# core/slowqueries.py
+import json
+import logging
+import os
+import re
+from logging.handlers import RotatingFileHandler
+
+from django.db import connections
+
+
+logger = logging.getLogger("core.slowquery")
+
+
+# ======================
+# Query plans
+# ======================
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_FULL_SCAN = {
+    # SQLite: "SCAN core_lesson [USING INDEX ...]" walks every row;
+    # "SEARCH core_lesson USING INDEX ..." is a lookup.
+    "sqlite": re.compile(r"\bSCAN (?!CONSTANT ROW)"),
+    "postgresql": re.compile(r"\bSeq Scan\b"),
+}
+
+
+def explain(connection, sql, params=None):
+    """
+    Query plan lines for a SELECT (never EXPLAIN ANALYZE: the statement is
+    not run again). Returns [] for statements that cannot be explained.
+    """
+    if not _EXPLAINABLE.match(sql):
+        return []
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        rows = cursor.fetchall()
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def full_scans(plan, vendor):
+    """The plan lines that read a whole table."""
+    pattern = _FULL_SCAN.get(vendor)
+    return [line for line in plan if pattern and pattern.search(line)]
+
+
+# ======================
+# Slow query log
+# ======================
+
+MAX_PER_REQUEST = 10  # slow queries kept per request
+MAX_SQL_CHARS = 4000
+
+
+class SlowQueryFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that creates the log directory on first write."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.baseFilename)), exist_ok=True)
+        return super()._open()
+
+
+def log_slow_queries(request, queries, explain_plans=True, log_params=False):
+    """
+    Write one structured (JSON) record per slow query to the "core.slowquery"
+    logger. `queries` is QueryStats.slow: (alias, sql, params, many, ms).
+    Runs after the view has returned, so EXPLAIN never disturbs an open cursor.
+    Each distinct statement is explained once per request.
+
+    Parameter values can be password hashes or session data, so only their
+    types are logged unless `log_params` is set.
+    """
+    match = getattr(request, "resolver_match", None)
+    view = match.view_name if match else "-"
+    plans = {}
+    for alias, sql, params, many, ms in queries:
+        connection = connections[alias]
+        record = {
+            "view": view,
+            "method": request.method,
+            "path": request.path,
+            "db": alias,
+            "vendor": connection.vendor,
+            "ms": round(ms, 2),
+            "sql": sql[:MAX_SQL_CHARS],
+            "params": _params(params, many, log_params),
+        }
+        if explain_plans and not many:
+            key = (alias, sql)
+            if key not in plans:
+                try:
+                    plans[key] = explain(connection, sql, params)
+                except Exception as e:  # the plan is best-effort
+                    plans[key] = [f"EXPLAIN failed: {e}"]
+            record["plan"] = plans[key]
+            record["full_scans"] = full_scans(plans[key], connection.vendor)
+        logger.warning(json.dumps(record, default=str, ensure_ascii=False))
+
+
+def _params(params, many, values=False):
+    if params is None:
+        return None
+    show = _short if values else _type_name
+    if many:
+        params = list(params)
+        return {"rows": len(params), "first": [show(v) for v in params[0]] if params else None}
+    if isinstance(params, dict):
+        return {k: show(v) for k, v in params.items()}
+    return [show(v) for v in params]
+
+
+def _type_name(value):
+    return None if value is None else type(value).__name__
+
+
+def _short(value, limit=200):
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + "…"
+    return value
@@ -0,0 +1,142 @@
+# core/staticfiles.py
+import logging
+import mimetypes
+import posixpath
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .compression import available_encodings, compress, negotiate
+
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# Hashed + precompressed storage
+# ======================
+
+COMPRESS_EXTENSIONS = (".js", ".css", ".svg", ".html", ".json", ".txt", ".map", ".xml")
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    collectstatic writes content-hashed copies (app.3f2a9c1e.js) plus a
+    .gz (and, with brotli installed, .br) next to every hashed text asset,
+    compressed once at the highest level. StaticAssetMiddleware serves them.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = []
+        for name, hashed_name, processed in super().post_process(paths, dry_run=dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed.append(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in set(hashed):
+            if hashed_name.endswith(COMPRESS_EXTENSIONS):
+                self._precompress(hashed_name)
+
+    def _precompress(self, name):
+        path = Path(self.path(name))
+        data = path.read_bytes()
+        if len(data) < settings.COMPRESS_MIN_BYTES:
+            return
+        for encoding in available_encodings():
+            body = compress(data, encoding, fast=False)
+            if len(body) < len(data):
+                path.with_name(path.name + SUFFIXES[encoding]).write_bytes(body)
+
+    def url(self, name, force=False):
+        try:
+            return super().url(name, force)
+        except ValueError:
+            # A missing asset must not take the whole page down with it.
+            logger.warning("static asset %r is missing from the manifest", name)
+            return FileSystemStorage.url(self, name)
+
+
+# ======================
+# Serving
+# ======================
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+SHORT_LIVED = "public, max-age=300"
+
+
+class StaticAssetMiddleware:
+    """
+    Serves STATIC_ROOT under STATIC_URL when DEBUG is off (with DEBUG on
+    it removes itself, so a stale STATIC_ROOT never shadows the sources):
+
+    - hashed names from the manifest get `Cache-Control: immutable` for a
+      year, so repeat visits send no request at all;
+    - other files are cached briefly and revalidated with ETag /
+      Last-Modified, so an unchanged file costs a 304;
+    - the .br / .gz variant written by collectstatic is chosen from
+      Accept-Encoding and sent with Content-Encoding and Vary.
+
+    Put it first in MIDDLEWARE so assets skip sessions, auth and metrics.
+    """
+
+    def __init__(self, get_response):
+        if settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith("/") else "/" + settings.STATIC_URL
+        self.root = Path(settings.STATIC_ROOT).resolve() if settings.STATIC_ROOT else None
+        self._immutable = None
+
+    def immutable_names(self):
+        if self._immutable is None:
+            self._immutable = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        return self._immutable
+
+    def __call__(self, request):
+        if (
+            self.root is None
+            or request.method not in ("GET", "HEAD")
+            or not request.path_info.startswith(self.prefix)
+        ):
+            return self.get_response(request)
+
+        name = posixpath.normpath(request.path_info[len(self.prefix):]).lstrip("/")
+        path = (self.root / name).resolve()
+        if name.startswith("..") or self.root not in path.parents or not path.is_file():
+            return self.get_response(request)
+        return self.serve(request, name, path)
+
+    def serve(self, request, name, path):
+        content_type, _ = mimetypes.guess_type(name)
+        offered = [e for e in ("br", "gzip") if path.with_name(path.name + SUFFIXES[e]).is_file()]
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"), offered) if offered else None
+        if encoding:
+            path = path.with_name(path.name + SUFFIXES[encoding])
+
+        stat = path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'  # per file, so per encoding
+        not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if isinstance(not_modified, HttpResponseNotModified):
+            response = not_modified
+        else:
+            response = FileResponse(
+                path.open("rb"),
+                content_type=content_type or "application/octet-stream",
+                filename=posixpath.basename(name),  # not the .gz / .br name
+            )
+            response["Content-Length"] = str(stat.st_size)
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        response["Cache-Control"] = IMMUTABLE if name in self.immutable_names() else SHORT_LIVED
+        return response
@@ -45,9 +45,20 @@ urlpatterns = [
     path("api/quiz/history", views.api_quiz_history, name="api_quiz_history"),
     path("api/quiz/seed", views.api_quiz_seed, name="api_quiz_seed"),          # demo seed
 
+    # ==============================
+    # Study Hub APIs
+    # ==============================
+    path("api/resources/search", views.api_resources_search, name="api_resources_search"),  # ?q=&exam_slug=&cursor=
+    path("api/hub/weightage-trends", views.api_weightage_trends, name="api_weightage_trends"),  # ?exam_slug=
+
     # ==============================
     # AI Assistant APIs
     # ==============================
     path("api/ai/start", views.api_ai_start, name="api_ai_start"),
     path("api/ai/message", views.api_ai_message, name="api_ai_message"),
+
+    # ==============================
+    # Monitoring
+    # ==============================
+    path("metrics", views.metrics, name="metrics"),
 ]
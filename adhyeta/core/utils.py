@@ -3,8 +3,13 @@ import os
 import secrets
 from datetime import timedelta
 
+from django.core.cache import caches
+from django.db.models import F
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
 from .models import OTPCode
+from .writebehind import login_timestamps
 
 
 # ======================
@@ -22,52 +27,111 @@ def generate_otp(length: int = 6) -> str:
     return str(secrets.randbelow(10 ** length)).zfill(length)
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+OTP_OK = "ok"
+OTP_INVALID = "invalid"
+OTP_LOCKED = "locked"
+
+
+def _otp_hash(user, code: str) -> str:
+    return salted_hmac("core.otp", f"{user.pk}:{code}").hexdigest()
+
+
+def _otp_store():
+    # The shared alias, not the tiered default: a used or revoked OTP must be
+    # seen by every worker at once, not after the L1 expires.
+    return caches["shared"]
+
+
+def _otp_cache_key(user) -> str:
+    return f"otp:{user.pk}"
+
+
 def create_otp_for_user(user, length: int = 6) -> str:
     """
     Create & store a new OTP for the given user. Returns the OTP string.
     Note: Delivery (SMS/Email) should be handled by the caller.
+
+    The code's HMAC is cached with a TTL of OTP_EXPIRE_MINUTES (default 10)
+    and written to OTPCode as a fallback; any previous OTP is revoked.
     """
     otp = generate_otp(length=length)
-    OTPCode.objects.create(user=user, code=otp)
+    ttl = _env_int("OTP_EXPIRE_MINUTES", 10) * 60
+    code_hash = _otp_hash(user, otp)
+
+    OTPCode.objects.filter(user=user).delete()
+    OTPCode.objects.create(
+        user=user, code_hash=code_hash, expires_at=timezone.now() + timedelta(seconds=ttl)
+    )
+    _otp_store().set(_otp_cache_key(user), code_hash, ttl)
+
     # For dev visibility; remove in prod:
     print(f"[DEBUG] OTP for {user.username}: {otp}")
     return otp
 
 
-def verify_otp(user, code: str, expire_minutes: int | None = None) -> bool:
+def check_otp(user, code: str, consume: bool = False) -> str:
     """
-    Verify if the given OTP is valid for the user.
-    Marks the OTP as used on success.
-
-    Args:
-        user: Django User instance
-        code: OTP string user submitted
-        expire_minutes: optional expiry window. If None, reads from
-                        env OTP_EXPIRE_MINUTES (default 10).
+    Shared OTP check for verify and reset. Returns OTP_OK, OTP_INVALID or
+    OTP_LOCKED (too many wrong attempts; the OTP is revoked).
+
+    Every check first reserves an attempt on the OTPCode row with a single
+    conditional UPDATE, so concurrent guesses (on any worker) can never get
+    past OTP_MAX_ATTEMPTS; a correct code that is not consumed gives its
+    attempt back. The hash is then read from the cache, falling back to the
+    row when the cache has no entry (e.g. it was evicted or flushed).
+    With `consume=True` a valid OTP is deleted so it cannot be reused.
     """
     if not code:
-        return False
+        return OTP_INVALID
+
+    max_attempts = _env_int("OTP_MAX_ATTEMPTS", 5)
+    live = OTPCode.objects.filter(user=user, is_used=False, expires_at__gt=timezone.now())
+    if not live.filter(attempts__lt=max_attempts).update(attempts=F("attempts") + 1):
+        return OTP_LOCKED if live.exists() else OTP_INVALID
+
+    store = _otp_store()
+    stored = store.get(_otp_cache_key(user))
+    if stored is None:
+        stored = live.values_list("code_hash", flat=True).first()
+
+    if stored is None or not constant_time_compare(stored, _otp_hash(user, code)):
+        if live.filter(attempts__gte=max_attempts).exists():
+            # The row stays (until it expires or a new OTP replaces it) so
+            # later guesses are answered LOCKED without comparing anything.
+            store.delete(_otp_cache_key(user))
+            return OTP_LOCKED
+        return OTP_INVALID
+
+    if consume:
+        revoke_otps(user)
+    else:
+        live.update(attempts=F("attempts") - 1)
+    return OTP_OK
+
+
+def verify_otp(user, code: str) -> bool:
+    """
+    Verify and consume the user's OTP. Returns True on success.
+    """
+    return check_otp(user, code, consume=True) == OTP_OK
 
-    if expire_minutes is None:
-        try:
-            expire_minutes = int(os.getenv("OTP_EXPIRE_MINUTES", "10"))
-        except ValueError:
-            expire_minutes = 10
 
-    try:
-        # Latest unused OTP matching this code
-        otp_qs = OTPCode.objects.filter(user=user, code=code, is_used=False)
-        if expire_minutes > 0:
-            cutoff = timezone.now() - timedelta(minutes=expire_minutes)
-            otp_qs = otp_qs.filter(created_at__gte=cutoff)
+def revoke_otps(user) -> None:
+    _otp_store().delete(_otp_cache_key(user))
+    OTPCode.objects.filter(user=user).delete()
 
-        otp_obj = otp_qs.latest("created_at")  # relies on created_at field
-    except OTPCode.DoesNotExist:
-        return False
 
-    otp_obj.is_used = True
-    otp_obj.save(update_fields=["is_used"])
-    return True
+def purge_expired_otps() -> int:
+    """Delete expired OTP rows (range scan on the expires_at index)."""
+    deleted, _ = OTPCode.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
 
 
 # ======================
@@ -102,11 +166,24 @@ def error_response(message: str, code: int = 400) -> dict:
 # Profile helpers
 # ======================
 
-def update_last_login(user) -> None:
+def update_last_login(sender=None, user=None, **kwargs) -> None:
     """
-    Update the last login time on the user's StudentProfile (if present).
+    user_logged_in receiver (replaces Django's own update_last_login).
+
+    Sets User.last_login and StudentProfile.last_login_at on the in-memory
+    objects and queues the database write in core.writebehind, which
+    flushes both tables in batches.
     """
+    now = timezone.now()
+    user.last_login = now
     profile = getattr(user, "profile", None)
     if profile:
-        profile.last_login_at = timezone.now()
-        profile.save(update_fields=["last_login_at"])
+        profile.last_login_at = now
+    login_timestamps.record(user.pk, now)
+
+
+def last_login_for(user):
+    """Latest login time, including a not-yet-flushed write-behind value."""
+    profile = getattr(user, "profile", None)
+    stored = profile.last_login_at if profile else user.last_login
+    return login_timestamps.pending(user.pk) or stored
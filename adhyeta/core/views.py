@@ -1,14 +1,16 @@
 # core/views.py
 import json
 import re
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 
-from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.conf import settings
+from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.db.models import Count, Q
 from django.db.models.functions import TruncDate
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.shortcuts import render
 from django.utils import timezone
 from django.utils.html import strip_tags
@@ -16,25 +18,32 @@ from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_POST, require_http_methods
 
 from .models import (
-    StudentProfile, OTPCode,
+    StudentProfile,
     Course, Topic, Lesson, Enrollment, LessonProgress,
     QuizQuestion, QuizChoice, QuizAttempt, AttemptAnswer,
     AssistantThread, AssistantMessage,
     StudyPlan, StudyTask,
     Exam, Subject, SubjectWeightage, Resource
 )
-from .utils import create_otp_for_user, update_last_login
+from .analytics import DEFAULT_WINDOW, planner_allocation, weightage_trends
+from .cache import cached_json
+from .idempotency import idempotent
+from .importers import ContentImporter
+from .jsonrender import JSONResponse
+from .metrics import ASSISTANT_MESSAGES, LESSONS_MARKED, QUIZZES_SUBMITTED, REGISTRY
+from .search import SEARCH_PAGE_SIZE, search_resources
+from .utils import OTP_LOCKED, OTP_OK, check_otp, create_otp_for_user, last_login_for
 
 
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
 def ok(data=None, status=200):
-    return JsonResponse({"ok": True, "data": data or {}}, status=status)
+    return JSONResponse({"ok": True, "data": data or {}}, status=status)
 
 
 def fail(message, status=400):
-    return JsonResponse({"ok": False, "error": message}, status=status)
+    return JSONResponse({"ok": False, "error": message}, status=status)
 
 
 def json_payload(request):
@@ -85,9 +94,7 @@ def api_signup(request):
         user=user, phone=phone, student_type=student_type
     )
 
-    login(request, user)
-    profile.last_login_at = timezone.now()
-    profile.save()
+    login(request, user)  # sets profile.last_login_at via utils.update_last_login
 
     return ok(
         {
@@ -117,21 +124,12 @@ def api_login(request):
     if not username or not password:
         return fail("username/email and password are required")
 
+    # EmailOrUsernameBackend resolves username or email in one query + one hash
     user = authenticate(request, username=username, password=password)
-    if not user:
-        # Try email lookup then authenticate with stored username
-        U = get_user_model()
-        try:
-            u = U.objects.get(email__iexact=username)
-            user = authenticate(request, username=u.username, password=password)
-        except U.DoesNotExist:
-            user = None
-
     if not user:
         return fail("Invalid credentials", 401)
 
-    login(request, user)
-    update_last_login(user)
+    login(request, user)  # queues last-login writes (core.writebehind)
     pfp = user.profile  # assuming OneToOne related_name='profile'
     return ok(
         {
@@ -160,6 +158,7 @@ def api_me(request):
 
     u = request.user
     p = u.profile
+    last_login = last_login_for(u)
     display_name = (f"{u.first_name} {u.last_name}".strip() or u.username.split("@")[0])
     return ok(
         {
@@ -168,7 +167,7 @@ def api_me(request):
             "phone": p.phone,
             "student_type": p.student_type,
             "created_at": p.created_at.isoformat(),
-            "last_login": (p.last_login_at.isoformat() if p.last_login_at else None),
+            "last_login": (last_login.isoformat() if last_login else None),
         }
     )
 
@@ -197,7 +196,7 @@ def api_forgot_password(request):
 
 @require_POST
 def api_verify_otp(request):
-    """Check OTP exists and is unused. Does not consume the OTP."""
+    """Check the OTP is valid and unexpired. Does not consume the OTP."""
     p = json_payload(request)
     email = (p.get("email") or "").strip().lower()
     code = (p.get("code") or "").strip()
@@ -207,12 +206,10 @@ def api_verify_otp(request):
     except User.DoesNotExist:
         return fail("Invalid user.", status=404)
 
-    otp_obj = (
-        OTPCode.objects.filter(user=user, code=code, is_used=False)
-        .order_by("-created_at")
-        .first()
-    )
-    if not otp_obj:
+    result = check_otp(user, code)
+    if result == OTP_LOCKED:
+        return fail("Too many attempts. Request a new OTP.", status=429)
+    if result != OTP_OK:
         return fail("Invalid OTP.", status=400)
 
     return ok()  # valid
@@ -233,18 +230,14 @@ def api_reset_password(request):
     except User.DoesNotExist:
         return fail("Invalid user.", status=404)
 
-    otp_obj = (
-        OTPCode.objects.filter(user=user, code=code, is_used=False)
-        .order_by("-created_at")
-        .first()
-    )
-    if not otp_obj:
+    result = check_otp(user, code, consume=True)
+    if result == OTP_LOCKED:
+        return fail("Too many attempts. Request a new OTP.", status=429)
+    if result != OTP_OK:
         return fail("Invalid OTP.", status=400)
 
     user.set_password(new_password)
-    user.save()
-    otp_obj.is_used = True
-    otp_obj.save()
+    user.save(update_fields=["password"])
 
     return ok({"message": "Password updated"})
 
@@ -253,6 +246,7 @@ def api_reset_password(request):
 # Learning: Courses / Topics / Lessons / Progress
 # ---------------------------------------------------------------------
 @require_GET
+@cached_json("catalog", timeout=600, soft_timeout=120)
 def api_courses(request):
     qs = Course.objects.annotate(
         topics_count=Count("topics"), lessons_count=Count("topics__lessons")
@@ -272,6 +266,7 @@ def api_courses(request):
 
 
 @require_GET
+@cached_json("catalog", timeout=600, soft_timeout=120)
 def api_topics(request):
     course_id = request.GET.get("course_id")
     try:
@@ -321,7 +316,26 @@ def api_lessons(request):
     return ok({"topic": {"id": topic.id, "title": topic.title}, "lessons": lessons})
 
 
+def mark_lesson_completed(user, lesson_id, course_id):
+    """
+    Single-statement upserts on unique_lesson_progress / unique_enrollment,
+    so concurrent requests for the same lesson never race into an
+    IntegrityError.
+    """
+    with transaction.atomic():
+        LessonProgress.objects.bulk_create(
+            [LessonProgress(user=user, lesson_id=lesson_id, completed=True, completed_at=timezone.now())],
+            update_conflicts=True,
+            unique_fields=["user", "lesson"],
+            update_fields=["completed", "completed_at"],
+        )
+        Enrollment.objects.bulk_create(
+            [Enrollment(user=user, course_id=course_id)], ignore_conflicts=True
+        )
+
+
 @require_POST
+@idempotent
 def api_mark_lesson(request):
     if not request.user.is_authenticated:
         return fail("Login required", 401)
@@ -329,17 +343,13 @@ def api_mark_lesson(request):
     p = json_payload(request)
     lesson_id = p.get("lesson_id")
     try:
-        lesson = Lesson.objects.get(id=lesson_id)
+        lesson_id, course_id = Lesson.objects.values_list("id", "topic__course_id").get(id=lesson_id)
     except (Lesson.DoesNotExist, ValueError, TypeError):
         return fail("Invalid lesson_id", 400)
 
-    lp, _ = LessonProgress.objects.get_or_create(user=request.user, lesson=lesson)
-    lp.completed = True
-    lp.completed_at = timezone.now()
-    lp.save()
-
-    Enrollment.objects.get_or_create(user=request.user, course=lesson.topic.course)
-    return ok({"lesson_id": lesson.id, "completed": True})
+    mark_lesson_completed(request.user, lesson_id, course_id)
+    LESSONS_MARKED.inc()
+    return ok({"lesson_id": lesson_id, "completed": True})
 
 
 @require_GET
@@ -373,33 +383,21 @@ def api_seed_demo(request):
     if Course.objects.exists():
         return ok({"message": "Demo content already present"})
 
-    c = Course.objects.create(
-        title="Data Structures (Beginner)",
-        description="Start with arrays, stacks, queues and complexity basics.",
-    )
-    t1 = Topic.objects.create(course=c, title="Arrays", summary="Basics, indexing, operations")
-    t2 = Topic.objects.create(
-        course=c, title="Stacks & Queues", summary="LIFO/FIFO with examples"
-    )
-
-    Lesson.objects.create(
-        topic=t1,
-        order=1,
-        title="What is an Array?",
-        content="<p>Array is a contiguous block of memory...</p>",
-    )
-    Lesson.objects.create(
-        topic=t1,
-        order=2,
-        title="Array Operations",
-        content="<ul><li>Insert</li><li>Delete</li><li>Traverse</li></ul>",
-    )
-    Lesson.objects.create(
-        topic=t2, order=1, title="Stacks", content="<p>Stack supports push/pop/peek. Use cases...</p>"
-    )
-    Lesson.objects.create(
-        topic=t2, order=2, title="Queues", content="<p>Queue supports enqueue/dequeue. Use cases...</p>"
-    )
+    course = "Data Structures (Beginner)"
+    ContentImporter().feed([
+        {"type": "course", "title": course,
+         "description": "Start with arrays, stacks, queues and complexity basics."},
+        {"type": "topic", "course": course, "title": "Arrays", "summary": "Basics, indexing, operations"},
+        {"type": "topic", "course": course, "title": "Stacks & Queues", "summary": "LIFO/FIFO with examples"},
+        {"type": "lesson", "course": course, "topic": "Arrays", "order": 1, "title": "What is an Array?",
+         "content": "<p>Array is a contiguous block of memory...</p>"},
+        {"type": "lesson", "course": course, "topic": "Arrays", "order": 2, "title": "Array Operations",
+         "content": "<ul><li>Insert</li><li>Delete</li><li>Traverse</li></ul>"},
+        {"type": "lesson", "course": course, "topic": "Stacks & Queues", "order": 1, "title": "Stacks",
+         "content": "<p>Stack supports push/pop/peek. Use cases...</p>"},
+        {"type": "lesson", "course": course, "topic": "Stacks & Queues", "order": 2, "title": "Queues",
+         "content": "<p>Queue supports enqueue/dequeue. Use cases...</p>"},
+    ])
 
     return ok({"message": "Demo course created"})
 
@@ -419,12 +417,14 @@ def api_progress_weekly(request):
     today = timezone.localdate()
     start = today - timedelta(days=6)
 
+    # A plain range on completed_at (not __date) so core_lp_user_done_at is used.
+    tz = timezone.get_current_timezone()
     raw = (
         LessonProgress.objects.filter(
             user=user,
             completed=True,
-            completed_at__date__gte=start,
-            completed_at__date__lte=today,
+            completed_at__gte=datetime.combine(start, time.min, tzinfo=tz),
+            completed_at__lt=datetime.combine(today + timedelta(days=1), time.min, tzinfo=tz),
         )
         .annotate(day=TruncDate("completed_at"))
         .values("day")
@@ -475,77 +475,41 @@ def pick_weak_topics_for_user(user, limit_topics=2):
     return topics
 
 
+def _demo_quiz_records(t):
+    def q(difficulty, text, explanation, choices, correct):
+        return {
+            "type": "question", "course": t.course.title, "topic": t.title,
+            "difficulty": difficulty, "text": text, "explanation": explanation,
+            "choices": [{"text": c, "correct": i == correct} for i, c in enumerate(choices)],
+        }
+
+    return [
+        q("easy", f"In {t.title}, what is the typical time to access an element by index?",
+          "Index access in arrays is O(1) on average.",
+          ["O(1)", "O(n)", "O(log n)", "O(n log n)"], 0),
+        q("med", f"Which operation is NOT typical for {t.title.lower()}?",
+          "Trick depends on topic; the incorrect choice identifies the odd one.",
+          ["Traversal", "Insertion", "Compilation", "Deletion"], 2),
+        q("med", f"{t.title}: Which is true about space usage?",
+          "Generic conceptual explanation.",
+          ["Depends on implementation", "Always O(1) space", "Always O(n^2) space", "Space is irrelevant"], 0),
+        q("hard", f"Select the best use-case for {t.title.lower()}.",
+          "Patterns differ by DS; correct choice names a realistic use-case.",
+          ["Scheduling / order maintenance", "Washing machine cycle", "Color calibration", "DNS root hints"], 0),
+    ]
+
+
 @require_http_methods(["POST"])
 def api_quiz_seed(request):
     """Create a few sample questions if none exist."""
     if QuizQuestion.objects.exists():
         return ok({"message": "Quiz items already present"})
 
-    topics = Topic.objects.all()[:2]
-    if topics.count() == 0:
+    topics = list(Topic.objects.select_related("course")[:2])
+    if not topics:
         return fail("Create topics first (use /api/seed-demo).", 400)
 
-    for t in topics:
-        q1 = QuizQuestion.objects.create(
-            topic=t,
-            difficulty="easy",
-            text=f"In {t.title}, what is the typical time to access an element by index?",
-            explanation="Index access in arrays is O(1) on average.",
-        )
-        QuizChoice.objects.bulk_create(
-            [
-                QuizChoice(question=q1, text="O(1)", is_correct=True),
-                QuizChoice(question=q1, text="O(n)"),
-                QuizChoice(question=q1, text="O(log n)"),
-                QuizChoice(question=q1, text="O(n log n)"),
-            ]
-        )
-
-        q2 = QuizQuestion.objects.create(
-            topic=t,
-            difficulty="med",
-            text=f"Which operation is NOT typical for {t.title.lower()}?",
-            explanation="Trick depends on topic; the incorrect choice identifies the odd one.",
-        )
-        QuizChoice.objects.bulk_create(
-            [
-                QuizChoice(question=q2, text="Traversal"),
-                QuizChoice(question=q2, text="Insertion"),
-                QuizChoice(question=q2, text="Compilation", is_correct=True),
-                QuizChoice(question=q2, text="Deletion"),
-            ]
-        )
-
-        q3 = QuizQuestion.objects.create(
-            topic=t,
-            difficulty="med",
-            text=f"{t.title}: Which is true about space usage?",
-            explanation="Generic conceptual explanation.",
-        )
-        QuizChoice.objects.bulk_create(
-            [
-                QuizChoice(question=q3, text="Depends on implementation", is_correct=True),
-                QuizChoice(question=q3, text="Always O(1) space"),
-                QuizChoice(question=q3, text="Always O(n^2) space"),
-                QuizChoice(question=q3, text="Space is irrelevant"),
-            ]
-        )
-
-        q4 = QuizQuestion.objects.create(
-            topic=t,
-            difficulty="hard",
-            text=f"Select the best use-case for {t.title.lower()}.",
-            explanation="Patterns differ by DS; correct choice names a realistic use-case.",
-        )
-        QuizChoice.objects.bulk_create(
-            [
-                QuizChoice(question=q4, text="Scheduling / order maintenance", is_correct=True),
-                QuizChoice(question=q4, text="Washing machine cycle"),
-                QuizChoice(question=q4, text="Color calibration"),
-                QuizChoice(question=q4, text="DNS root hints"),
-            ]
-        )
-
+    ContentImporter().feed(rec for t in topics for rec in _demo_quiz_records(t))
     return ok({"message": "Quiz seed created"})
 
 
@@ -604,6 +568,7 @@ def api_quiz_generate(request):
 
 @login_required
 @require_http_methods(["POST"])
+@idempotent
 def api_quiz_submit(request):
     """
     Body:
@@ -640,6 +605,7 @@ def api_quiz_submit(request):
     attempt.score = score
     attempt.total = total
     attempt.save()
+    QUIZZES_SUBMITTED.inc()
 
     feedback = []
     for a in attempt.answers.select_related("question", "chosen_choice"):
@@ -657,6 +623,59 @@ def api_quiz_submit(request):
     return ok({"attempt_id": attempt.id, "score": score, "total": total, "feedback": feedback})
 
 
+# ---------------------------------------------------------------------
+# Study Hub: resource catalog search
+# ---------------------------------------------------------------------
+@require_GET
+def api_resources_search(request):
+    """
+    Full-text search over Resource title/source with facet counts.
+    Params: ?q=&exam_slug=&subject_id=&kinds=paper,notes&year=&cursor=&limit=&include_dead=1
+    """
+    kinds = [k for k in (request.GET.get("kinds") or "").split(",") if k]
+    try:
+        subject_id = int(request.GET.get("subject_id") or 0) or None
+        year = int(request.GET.get("year") or 0) or None
+        cursor = int(request.GET.get("cursor") or 0) or None
+        limit = int(request.GET.get("limit") or SEARCH_PAGE_SIZE)
+    except ValueError:
+        return fail("Invalid numeric parameter", 400)
+
+    result = search_resources(
+        q=request.GET.get("q", ""),
+        exam_slug=request.GET.get("exam_slug") or None,
+        subject_id=subject_id,
+        kinds=kinds,
+        year=year,
+        cursor=cursor,
+        limit=limit,
+        include_dead=request.GET.get("include_dead") == "1",
+    )
+    return ok(result)
+
+
+@require_GET
+def api_weightage_trends(request):
+    """
+    Multi-year weightage trends for an exam, plus an optional planner split.
+    Params: ?exam_slug=&window=3&daily_minutes=180
+    """
+    try:
+        exam = Exam.objects.get(slug=request.GET.get("exam_slug") or "")
+    except Exam.DoesNotExist:
+        return fail("Invalid exam_slug", 400)
+    try:
+        window = max(1, min(int(request.GET.get("window") or DEFAULT_WINDOW), 10))
+        daily_minutes = int(request.GET.get("daily_minutes") or 0)
+    except ValueError:
+        return fail("Invalid numeric parameter", 400)
+
+    data = {"exam": {"slug": exam.slug, "name": exam.name}, **weightage_trends(exam.id, window=window)}
+    if daily_minutes > 0:
+        data["allocation"] = planner_allocation(exam.id, daily_minutes)
+    return ok(data)
+
+
 # ---------------------------------------------------------------------
 # In-app Assistant (very light intent engine)
 # ---------------------------------------------------------------------
@@ -778,6 +797,7 @@ def api_ai_start(request):
 
 @login_required
 @require_POST
+@idempotent
 def api_ai_message(request):
     """
     Handles incoming user messages to the AI assistant and returns a reply.
@@ -807,5 +827,18 @@ def api_ai_message(request):
 
     # Save assistant message
     AssistantMessage.objects.create(thread=thread, role="assistant", content=reply_text)
+    ASSISTANT_MESSAGES.inc()
 
     return ok({"reply": reply_text, "thread_id": thread.id, "message_id": user_msg.id})
+
+
+# ---------------------------------------------------------------------
+# Monitoring
+# ---------------------------------------------------------------------
+@require_GET
+def metrics(request):
+    """Prometheus text exposition. Requires `Authorization: Bearer <METRICS_TOKEN>` when set."""
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return fail("Forbidden", 403)
+    return HttpResponse(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
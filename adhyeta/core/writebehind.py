@@ -0,0 +1,108 @@
+# core/writebehind.py
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, transaction
+from django.db.models import Case, DateTimeField, Value, When
+
+from .models import StudentProfile
+
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# Login timestamp write-behind
+# ======================
+
+FLUSH_CHUNK = 500  # users per UPDATE statement
+
+
+def _case(batch, key):
+    """CASE WHEN <key>=<id> THEN <ts> ... so a whole batch is one UPDATE."""
+    return Case(
+        *[When(then=Value(ts), **{key: uid}) for uid, ts in batch.items()],
+        output_field=DateTimeField(),
+    )
+
+
+class LoginTimestampBuffer:
+    """
+    Coalesces User.last_login / StudentProfile.last_login_at writes.
+
+    Request threads only record (user_id, timestamp) in memory; a daemon
+    thread flushes the latest value per user every `interval` seconds as
+    one UPDATE per table. With interval <= 0 every record is written
+    immediately (useful for tests and management commands).
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, user_id, when):
+        with self._lock:
+            prev = self._pending.get(user_id)
+            if prev is None or when > prev:
+                self._pending[user_id] = when
+        if self.interval <= 0:
+            self.flush()
+        else:
+            self._ensure_thread()
+
+    def pending(self, user_id):
+        """Not-yet-flushed timestamp for a user (read-your-writes for api_me)."""
+        with self._lock:
+            return self._pending.get(user_id)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        try:
+            items = list(batch.items())
+            with transaction.atomic():
+                for i in range(0, len(items), FLUSH_CHUNK):
+                    chunk = dict(items[i:i + FLUSH_CHUNK])
+                    User.objects.filter(pk__in=chunk.keys()).update(last_login=_case(chunk, "pk"))
+                    StudentProfile.objects.filter(user_id__in=chunk.keys()).update(
+                        last_login_at=_case(chunk, "user_id")
+                    )
+        except Exception:
+            logger.exception("login timestamp flush failed; re-queueing %d users", len(batch))
+            with self._lock:
+                for uid, ts in batch.items():
+                    if uid not in self._pending or self._pending[uid] < ts:
+                        self._pending[uid] = ts
+            return 0
+        return len(batch)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="login-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+login_timestamps = LoginTimestampBuffer(getattr(settings, "LOGIN_WRITE_BEHIND_SECONDS", 5.0))
+atexit.register(login_timestamps.flush)